@@ -1,6 +1,7 @@
 import asyncio
 import contextlib
 import logging
+from collections import deque
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Optional
 
@@ -116,43 +117,43 @@ class BaseAgent(metaclass=AgentMeta):
     def _add_to_agents_graph(self) -> None:
         from strix.tools.agents_graph import agents_graph_actions
 
-        # Get existing node data (may have been pre-registered with special fields)
-        existing = agents_graph_actions._agent_graph["nodes"].get(self.state.agent_id, {})
-
-        node = {
-            "id": self.state.agent_id,
-            "name": self.state.agent_name,
-            "task": self.state.task,
-            "status": "running",
-            "parent_id": self.state.parent_id,
-            "created_at": self.state.start_time,
-            "finished_at": None,
-            "result": None,
-            "llm_config": self.llm_config_name,
-            "agent_type": self.__class__.__name__,
-            "state": self.state.model_dump(),
-        }
-
-        # Preserve special fields from pre-registration (type, report_id for verification agents)
-        for key in ["type", "report_id"]:
-            if key in existing:
-                node[key] = existing[key]
-
-        agents_graph_actions._agent_graph["nodes"][self.state.agent_id] = node
-
-        agents_graph_actions._agent_instances[self.state.agent_id] = self
-        agents_graph_actions._agent_states[self.state.agent_id] = self.state
-
-        if self.state.parent_id:
-            agents_graph_actions._agent_graph["edges"].append(
-                {"from": self.state.parent_id, "to": self.state.agent_id, "type": "delegation"}
-            )
+        with agents_graph_actions._agent_graph_lock:
+            # Get existing node data (may have been pre-registered with special fields)
+            existing = agents_graph_actions._agent_graph["nodes"].get(self.state.agent_id, {})
+
+            node = {
+                "id": self.state.agent_id,
+                "name": self.state.agent_name,
+                "task": self.state.task,
+                "status": "running",
+                "parent_id": self.state.parent_id,
+                "created_at": self.state.start_time,
+                "finished_at": None,
+                "result": None,
+                "llm_config": self.llm_config_name,
+                "agent_type": self.__class__.__name__,
+                "state": self.state.model_dump(),
+            }
+
+            # Preserve special fields from pre-registration (type, report_id for verification agents)
+            for key in ["type", "report_id"]:
+                if key in existing:
+                    node[key] = existing[key]
+
+            agents_graph_actions._agent_graph["nodes"][self.state.agent_id] = node
+
+            agents_graph_actions._agent_instances[self.state.agent_id] = self
+            agents_graph_actions._agent_states[self.state.agent_id] = self.state
+
+            if self.state.parent_id:
+                agents_graph_actions._agent_graph["edges"].append(
+                    {"from": self.state.parent_id, "to": self.state.agent_id, "type": "delegation"}
+                )
 
-        if self.state.agent_id not in agents_graph_actions._agent_messages:
-            agents_graph_actions._agent_messages[self.state.agent_id] = []
+            agents_graph_actions._agent_messages.setdefault(self.state.agent_id, deque())
 
-        if self.state.parent_id is None and agents_graph_actions._root_agent_id is None:
-            agents_graph_actions._root_agent_id = self.state.agent_id
+            if self.state.parent_id is None and agents_graph_actions._root_agent_id is None:
+                agents_graph_actions._root_agent_id = self.state.agent_id
 
     def cancel_current_execution(self) -> None:
         if self._current_task and not self._current_task.done():
@@ -287,10 +288,15 @@ class BaseAgent(metaclass=AgentMeta):
                 tracer.update_agent_status(self.state.agent_id, "running")
 
             try:
-                from strix.tools.agents_graph.agents_graph_actions import _agent_graph
+                from strix.tools.agents_graph.agents_graph_actions import (
+                    _agent_graph,
+                    _agent_graph_lock,
+                )
 
-                if self.state.agent_id in _agent_graph["nodes"]:
-                    _agent_graph["nodes"][self.state.agent_id]["status"] = "running"
+                with _agent_graph_lock:
+                    node = _agent_graph["nodes"].get(self.state.agent_id)
+                    if node is not None:
+                        node["status"] = "running"
             except (ImportError, KeyError):
                 pass
 
@@ -444,18 +450,25 @@ class BaseAgent(metaclass=AgentMeta):
 
     def _check_agent_messages(self, state: AgentState) -> None:  # noqa: PLR0912
         try:
-            from strix.tools.agents_graph.agents_graph_actions import _agent_graph, _agent_messages
+            from strix.tools.agents_graph.agents_graph_actions import (
+                _agent_graph,
+                _agent_graph_lock,
+                _agent_messages,
+            )
 
             agent_id = state.agent_id
-            if not agent_id or agent_id not in _agent_messages:
-                return
-
-            messages = _agent_messages[agent_id]
+            with _agent_graph_lock:
+                inbox = _agent_messages.get(agent_id) if agent_id else None
+                if not inbox:
+                    return
+                # Drain the inbox so each message is only visited once
+                messages = list(inbox)
+                inbox.clear()
             if messages:
                 has_new_messages = False
                 for message in messages:
-                    if not message.get("read", False):
-                        sender_id = message.get("from")
+                    if not message.read:
+                        sender_id = message.from_
 
                         if state.is_waiting_for_input():
                             if state.llm_failed:
@@ -480,10 +493,11 @@ class BaseAgent(metaclass=AgentMeta):
 
                         if sender_id == "user":
                             sender_name = "User"
-                            state.add_message("user", message.get("content", ""))
+                            state.add_message("user", message.content)
                         else:
-                            if sender_id and sender_id in _agent_graph.get("nodes", {}):
-                                sender_name = _agent_graph["nodes"][sender_id]["name"]
+                            with _agent_graph_lock:
+                                sender_node = _agent_graph["nodes"].get(sender_id)
+                            sender_name = sender_node["name"] if sender_node else sender_id
 
                             message_content = f"""<inter_agent_message>
     <delivery_notice>
@@ -497,12 +511,12 @@ class BaseAgent(metaclass=AgentMeta):
         <agent_id>{sender_id}</agent_id>
     </sender>
     <message_metadata>
-        <type>{message.get("message_type", "information")}</type>
-        <priority>{message.get("priority", "normal")}</priority>
-        <timestamp>{message.get("timestamp", "")}</timestamp>
+        <type>{message.message_type}</type>
+        <priority>{message.priority}</priority>
+        <timestamp>{message.timestamp}</timestamp>
     </message_metadata>
     <content>
-{message.get("content", "")}
+{message.content}
     </content>
     <delivery_info>
         <note>This message was delivered during your task execution.
@@ -511,7 +525,7 @@ class BaseAgent(metaclass=AgentMeta):
 </inter_agent_message>"""
                             state.add_message("user", message_content.strip())
 
-                        message["read"] = True
+                        message.read = True
 
                 if has_new_messages and not state.is_waiting_for_input():
                     from strix.telemetry.tracer import get_global_tracer
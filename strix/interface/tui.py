@@ -1,11 +1,13 @@
 import argparse
 import asyncio
 import atexit
+import functools
 import logging
 import random
 import signal
 import sys
 import threading
+from collections import defaultdict
 from collections.abc import Callable
 from importlib.metadata import PackageNotFoundError
 from importlib.metadata import version as pkg_version
@@ -33,13 +35,35 @@ from textual.widgets.tree import TreeNode
 from strix.agents.StrixAgent import StrixAgent
 from strix.interface.utils import build_live_stats_text
 from strix.llm.config import LLMConfig
-from strix.telemetry.tracer import Tracer, set_global_tracer
+from strix.telemetry.tracer import ChatMessage, Tracer, set_global_tracer
 
 
 def escape_markup(text: str) -> str:
+    # Rich only rewrites "[" sequences and a trailing backslash; skip its regex otherwise.
+    if "[" not in text and not text.endswith("\\"):
+        return text
     return cast("str", rich_escape(text))
 
 
+_STATUS_ICONS = {
+    "running": "🟢",
+    "waiting": "🟡",
+    "completed": "✅",
+    "failed": "❌",
+    "stopped": "⏹️",
+    "stopping": "⏸️",
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _agent_label(name_raw: str, status: str) -> str:
+    return f"{_STATUS_ICONS.get(status, '🔵')} {escape_markup(name_raw)}"
+
+
+def _format_agent_label(agent_data: dict[str, Any]) -> str:
+    return _agent_label(agent_data.get("name", "Agent"), agent_data.get("status", "running"))
+
+
 def get_package_version() -> str:
     try:
         return pkg_version("strix-agent")
@@ -285,6 +309,7 @@ class StrixTUIApp(App):  # type: ignore[misc]
         set_global_tracer(self.tracer)
 
         self.agent_nodes: dict[str, TreeNode] = {}
+        self._children_by_parent: defaultdict[str, list[str]] = defaultdict(list)
 
         self._displayed_agents: set[str] = set()
         self._displayed_events: list[str] = []
@@ -778,12 +803,12 @@ class StrixTUIApp(App):  # type: ignore[misc]
         chat_events = [
             {
                 "type": "chat",
-                "timestamp": msg["timestamp"],
-                "id": f"chat_{msg['message_id']}",
+                "timestamp": msg.timestamp,
+                "id": f"chat_{msg.message_id}",
                 "data": msg,
             }
             for msg in self.tracer.chat_messages
-            if msg.get("agent_id") == agent_id
+            if msg.agent_id == agent_id
         ]
 
         tool_events = [
@@ -823,7 +848,7 @@ class StrixTUIApp(App):  # type: ignore[misc]
                     agent = StrixAgent(self.agent_config)
 
                     if not self._scan_stop_event.is_set():
-                        loop.run_until_complete(agent.execute_scan(self.scan_config))
+                        loop.run_until_complete(self._run_scan_until_stopped(agent))
 
                 except (KeyboardInterrupt, asyncio.CancelledError):
                     logging.info("Scan interrupted by user")
@@ -834,6 +859,11 @@ class StrixTUIApp(App):  # type: ignore[misc]
                 except Exception:
                     logging.exception("Unexpected error during scan")
                 finally:
+                    pending = asyncio.all_tasks(loop)
+                    for task in pending:
+                        task.cancel()
+                    if pending:
+                        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
                     loop.close()
                     self._scan_completed.set()
 
@@ -844,6 +874,18 @@ class StrixTUIApp(App):  # type: ignore[misc]
         self._scan_thread = threading.Thread(target=scan_target, daemon=True)
         self._scan_thread.start()
 
+    async def _run_scan_until_stopped(self, agent: StrixAgent) -> None:
+        scan_task = asyncio.create_task(agent.execute_scan(self.scan_config))
+
+        while not scan_task.done():
+            if self._scan_stop_event.is_set():
+                # The agent loop may absorb a cancellation mid-iteration, so keep
+                # re-issuing it until the task actually finishes.
+                scan_task.cancel()
+            await asyncio.wait({scan_task}, timeout=0.1)
+
+        await scan_task
+
     def _add_agent_node(self, agent_data: dict[str, Any]) -> None:
         if len(self.screen_stack) > 1 or self.show_splash:
             return
@@ -855,24 +897,15 @@ class StrixTUIApp(App):  # type: ignore[misc]
         parent_id = agent_data.get("parent_id")
         status = agent_data.get("status", "running")
 
+        if parent_id:
+            self._children_by_parent[parent_id].append(agent_id)
+
         try:
             agents_tree = self.query_one("#agents_tree", Tree)
         except (ValueError, Exception):
             return
 
-        agent_name_raw = agent_data.get("name", "Agent")
-
-        status_indicators = {
-            "running": "🟢",
-            "waiting": "🟡",
-            "completed": "✅",
-            "failed": "❌",
-            "stopped": "⏹️",
-            "stopping": "⏸️",
-        }
-
-        status_icon = status_indicators.get(status, "🔵")
-        agent_name = f"{status_icon} {escape_markup(agent_name_raw)}"
+        agent_name = _format_agent_label(agent_data)
 
         if status in ["running", "waiting"]:
             self._start_agent_verb_timer(agent_id)
@@ -926,21 +959,7 @@ class StrixTUIApp(App):  # type: ignore[misc]
 
     def _copy_node_under(self, node_to_copy: TreeNode, new_parent: TreeNode) -> None:
         agent_id = node_to_copy.data["agent_id"]
-        agent_data = self.tracer.agents.get(agent_id, {})
-        agent_name_raw = agent_data.get("name", "Agent")
-        status = agent_data.get("status", "running")
-
-        status_indicators = {
-            "running": "🟢",
-            "waiting": "🟡",
-            "completed": "✅",
-            "failed": "❌",
-            "stopped": "⏹️",
-            "stopping": "⏸️",
-        }
-
-        status_icon = status_indicators.get(status, "🔵")
-        agent_name = f"{status_icon} {escape_markup(agent_name_raw)}"
+        agent_name = _format_agent_label(self.tracer.agents.get(agent_id, {}))
 
         new_node = new_parent.add(
             agent_name,
@@ -957,15 +976,11 @@ class StrixTUIApp(App):  # type: ignore[misc]
             new_node.expand()
 
     def _reorganize_orphaned_agents(self, new_parent_id: str) -> None:
-        agents_to_move = []
-
-        for agent_id, agent_data in list(self.tracer.agents.items()):
-            if (
-                agent_data.get("parent_id") == new_parent_id
-                and agent_id in self.agent_nodes
-                and agent_id != new_parent_id
-            ):
-                agents_to_move.append(agent_id)
+        agents_to_move = [
+            agent_id
+            for agent_id in self._children_by_parent.get(new_parent_id, ())
+            if agent_id in self.agent_nodes and agent_id != new_parent_id
+        ]
 
         if not agents_to_move:
             return
@@ -984,11 +999,11 @@ class StrixTUIApp(App):  # type: ignore[misc]
                 old_node.remove()
 
         parent_node.allow_expand = True
-        self._expand_all_agent_nodes()
+        parent_node.expand()
 
-    def _render_chat_content(self, msg_data: dict[str, Any]) -> str:
-        role = msg_data.get("role")
-        content = msg_data.get("content", "")
+    def _render_chat_content(self, msg_data: ChatMessage) -> str:
+        role = msg_data.role
+        content = msg_data.content
 
         if not content:
             return ""
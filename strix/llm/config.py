@@ -9,6 +9,7 @@ class LLMConfig:
         prompt_modules: list[str] | None = None,
         timeout: int | None = None,
         scan_mode: str = "deep",
+        deduplicate_history: bool | None = None,
     ):
         self.model_name = model_name or os.getenv("STRIX_LLM", "openai/gpt-5")
 
@@ -20,4 +21,8 @@ class LLMConfig:
 
         self.timeout = timeout or int(os.getenv("LLM_TIMEOUT", "300"))
 
+        if deduplicate_history is None:
+            deduplicate_history = os.getenv("LLM_DEDUPLICATE_HISTORY", "false").lower() == "true"
+        self.deduplicate_history = deduplicate_history
+
         self.scan_mode = scan_mode if scan_mode in ["quick", "standard", "deep"] else "deep"
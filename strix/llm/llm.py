@@ -1,14 +1,18 @@
 import logging
 import os
+import re
 from dataclasses import dataclass
 from enum import Enum
-from fnmatch import fnmatch
+from fnmatch import translate
+from functools import cache, lru_cache
 from pathlib import Path
 from typing import Any
 
 import litellm
 from jinja2 import (
+    BytecodeCache,
     Environment,
+    FileSystemBytecodeCache,
     FileSystemLoader,
     select_autoescape,
 )
@@ -44,6 +48,38 @@ class LLMRequestFailedError(Exception):
         self.details = details
 
 
+_LLM_ERROR_MESSAGES: dict[type[Exception], str] = {
+    litellm.RateLimitError: "Rate limit exceeded",
+    litellm.AuthenticationError: "Invalid API key",
+    litellm.NotFoundError: "Model not found",
+    litellm.ContextWindowExceededError: "Context too long",
+    litellm.ContentPolicyViolationError: "Content policy violation",
+    litellm.ServiceUnavailableError: "Service unavailable",
+    litellm.Timeout: "Request timed out",
+    litellm.UnprocessableEntityError: "Unprocessable entity",
+    litellm.InternalServerError: "Internal server error",
+    litellm.APIConnectionError: "Connection error",
+    litellm.UnsupportedParamsError: "Unsupported parameters",
+    litellm.BudgetExceededError: "Budget exceeded",
+    litellm.APIResponseValidationError: "Response validation error",
+    litellm.JSONSchemaValidationError: "JSON schema validation error",
+    litellm.InvalidRequestError: "Invalid request",
+    litellm.BadRequestError: "Bad request",
+    litellm.APIError: "API error",
+    litellm.OpenAIError: "OpenAI error",
+}
+
+
+def _describe_llm_error(error: Exception) -> str:
+    message = _LLM_ERROR_MESSAGES.get(type(error))
+    if message is None:
+        message = next(
+            (msg for cls, msg in _LLM_ERROR_MESSAGES.items() if isinstance(error, cls)),
+            type(error).__name__,
+        )
+    return message
+
+
 SUPPORTS_STOP_WORDS_FALSE_PATTERNS: list[str] = [
     "o1*",
     "grok-4-0709",
@@ -71,28 +107,87 @@ REASONING_EFFORT_PATTERNS: list[str] = [
 
 def normalize_model_name(model: str) -> str:
     raw = (model or "").strip().lower()
-    if "/" in raw:
-        name = raw.split("/")[-1]
-        if ":" in name:
-            name = name.split(":", 1)[0]
-    else:
-        name = raw
+    name = raw.rpartition("/")[2].partition(":")[0] if "/" in raw else raw
     if name.endswith("-gguf"):
         name = name[: -len("-gguf")]
     return name
 
 
-def model_matches(model: str, patterns: list[str]) -> bool:
-    raw = (model or "").strip().lower()
-    name = normalize_model_name(model)
-    for pat in patterns:
-        pat_l = pat.lower()
-        if "/" in pat_l:
-            if fnmatch(raw, pat_l):
-                return True
-        elif fnmatch(name, pat_l):
-            return True
-    return False
+ModelPatterns = tuple[re.Pattern[str] | None, re.Pattern[str] | None]
+
+
+def compile_model_patterns(patterns: list[str]) -> ModelPatterns:
+    lowered = [pat.lower() for pat in patterns]
+
+    def _compile(group: list[str]) -> re.Pattern[str] | None:
+        if not group:
+            return None
+        return re.compile("|".join(translate(pat) for pat in group))
+
+    return (
+        _compile([pat for pat in lowered if "/" in pat]),
+        _compile([pat for pat in lowered if "/" not in pat]),
+    )
+
+
+_STOP_WORDS_FALSE_MATCHER = compile_model_patterns(SUPPORTS_STOP_WORDS_FALSE_PATTERNS)
+_REASONING_EFFORT_MATCHER = compile_model_patterns(REASONING_EFFORT_PATTERNS)
+
+
+def model_matches(model: str, patterns: ModelPatterns) -> bool:
+    slash_re, name_re = patterns
+    if slash_re is not None and slash_re.match((model or "").strip().lower()):
+        return True
+    return name_re is not None and name_re.match(normalize_model_name(model)) is not None
+
+
+@cache
+def _get_bytecode_cache() -> BytecodeCache | None:
+    try:
+        return FileSystemBytecodeCache()
+    except (OSError, RuntimeError) as e:
+        logger.debug(f"Jinja bytecode cache unavailable: {e}")
+        return None
+
+
+@cache
+def _get_jinja_env(agent_name: str) -> Environment:
+    prompt_dir = Path(__file__).parent.parent / "agents" / agent_name
+    prompts_dir = Path(__file__).parent.parent / "prompts"
+
+    return Environment(
+        loader=FileSystemLoader([prompt_dir, prompts_dir]),
+        autoescape=select_autoescape(enabled_extensions=(), default_for_string=False),
+        cache_size=-1,
+        auto_reload=False,
+        bytecode_cache=_get_bytecode_cache(),
+    )
+
+
+@lru_cache(maxsize=128)
+def _build_system_prompt(agent_name: str, scan_mode: str, prompt_modules: tuple[str, ...]) -> str:
+    jinja_env = _get_jinja_env(agent_name)
+
+    modules_to_load = [*prompt_modules, f"scan_modes/{scan_mode}"]
+    prompt_module_content = load_prompt_modules(modules_to_load, jinja_env)
+
+    return jinja_env.get_template("system_prompt.jinja").render(
+        get_tools_prompt=get_tools_prompt,
+        get_module=prompt_module_content.get,
+        loaded_module_names=list(prompt_module_content.keys()),
+        **prompt_module_content,
+    )
+
+
+_EPHEMERAL_CACHE_CONTROL: dict[str, str] = {"type": "ephemeral"}
+_MAX_CACHE_BREAKPOINTS = 4
+_SHARED_PROMPT_BOUNDARY = "<specialized_knowledge>"
+
+_DEDUP_MIN_CHARS = 512
+
+_IMAGE_REMOVED_TEXT = (
+    "[Screenshot removed - model does not support vision. Use view_source or execute_js instead.]"
+)
 
 
 class StepRole(str, Enum):
@@ -101,7 +196,7 @@ class StepRole(str, Enum):
     SYSTEM = "system"
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponse:
     content: str
     tool_invocations: list[dict[str, Any]] | None = None
@@ -111,7 +206,7 @@ class LLMResponse:
     thinking_blocks: list[dict[str, Any]] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestStats:
     input_tokens: int = 0
     output_tokens: int = 0
@@ -142,6 +237,21 @@ class LLM:
         self.agent_id = agent_id
         self._total_stats = RequestStats()
         self._last_request_stats = RequestStats()
+        self._identity_message: dict[str, Any] | None = None
+        self._identity_key: tuple[str | None, str | None] | None = None
+
+        self._include_stop = self._should_include_stop_param()
+        self._include_reasoning = self._should_include_reasoning_effort()
+        self._supports_vision = self._model_supports_vision()
+        self._is_anthropic = self._is_anthropic_model()
+        self._supports_prompt_caching = bool(supports_prompt_caching(self.config.model_name))
+        self._caching_on = (
+            self.config.enable_prompt_caching
+            and self._supports_prompt_caching
+            and self._is_anthropic
+        )
+
+        self._base_completion_args = self._build_base_completion_args()
 
         self.memory_compressor = MemoryCompressor(
             model_name=self.config.model_name,
@@ -149,30 +259,13 @@ class LLM:
         )
 
         if agent_name:
-            prompt_dir = Path(__file__).parent.parent / "agents" / agent_name
-            prompts_dir = Path(__file__).parent.parent / "prompts"
-
-            loader = FileSystemLoader([prompt_dir, prompts_dir])
-            self.jinja_env = Environment(
-                loader=loader,
-                autoescape=select_autoescape(enabled_extensions=(), default_for_string=False),
-            )
+            self.jinja_env = _get_jinja_env(agent_name)
 
             try:
-                modules_to_load = list(self.config.prompt_modules or [])
-                modules_to_load.append(f"scan_modes/{self.config.scan_mode}")
-
-                prompt_module_content = load_prompt_modules(modules_to_load, self.jinja_env)
-
-                def get_module(name: str) -> str:
-                    return prompt_module_content.get(name, "")
-
-                self.jinja_env.globals["get_module"] = get_module
-
-                self.system_prompt = self.jinja_env.get_template("system_prompt.jinja").render(
-                    get_tools_prompt=get_tools_prompt,
-                    loaded_module_names=list(prompt_module_content.keys()),
-                    **prompt_module_content,
+                self.system_prompt = _build_system_prompt(
+                    agent_name,
+                    self.config.scan_mode,
+                    tuple(self.config.prompt_modules or []),
                 )
             except (FileNotFoundError, OSError, ValueError) as e:
                 logger.warning(f"Failed to load system prompt for {agent_name}: {e}")
@@ -185,10 +278,15 @@ class LLM:
             self.agent_name = agent_name
         if agent_id:
             self.agent_id = agent_id
+        self._identity_message = None
+        self._identity_key = None
 
     def _build_identity_message(self) -> dict[str, Any] | None:
         if not (self.agent_name and str(self.agent_name).strip()):
             return None
+        key = (self.agent_name, self.agent_id)
+        if self._identity_message is not None and key == self._identity_key:
+            return self._identity_message
         identity_name = self.agent_name
         identity_id = self.agent_id
         content = (
@@ -203,17 +301,52 @@ class LLM:
             f"<agent_id>{identity_id}</agent_id>\n"
             "</agent_identity>\n\n"
         )
-        return {"role": "user", "content": content}
+        self._identity_message = {"role": "user", "content": content}
+        self._identity_key = key
+        return self._identity_message
+
+    def _deduplicate_history(
+        self, history: list[dict[str, Any]], offset: int = 0
+    ) -> list[dict[str, Any]]:
+        # offset is the number of messages sent ahead of history, so back-references
+        # number messages as the model sees them
+        first_seen: dict[tuple[str, str], int] = {}
+        deduplicated = history
+
+        for i, msg in enumerate(history):
+            content = msg.get("content")
+            if msg.get("role") not in ("assistant", "user") or not isinstance(content, str):
+                continue
+            if len(content) < _DEDUP_MIN_CHARS:
+                continue
+
+            key = (msg["role"], content)
+            if key not in first_seen:
+                first_seen[key] = i
+                continue
+
+            if deduplicated is history:
+                deduplicated = list(history)
+            deduplicated[i] = {
+                **msg,
+                "content": (
+                    f"[deduped: identical to message {offset + first_seen[key] + 1} above]"
+                ),
+            }
+
+        return deduplicated
 
     def _add_cache_control_to_content(
         self, content: str | list[dict[str, Any]]
     ) -> str | list[dict[str, Any]]:
         if isinstance(content, str):
-            return [{"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}]
+            return [{"type": "text", "text": content, "cache_control": _EPHEMERAL_CACHE_CONTROL}]
         if isinstance(content, list) and content:
             last_item = content[-1]
             if isinstance(last_item, dict) and last_item.get("type") == "text":
-                return content[:-1] + [{**last_item, "cache_control": {"type": "ephemeral"}}]
+                new_content = content.copy()
+                new_content[-1] = {**last_item, "cache_control": _EPHEMERAL_CACHE_CONTROL}
+                return new_content
         return content
 
     def _is_anthropic_model(self) -> bool:
@@ -222,73 +355,85 @@ class LLM:
         model_lower = self.config.model_name.lower()
         return any(provider in model_lower for provider in ["anthropic/", "claude"])
 
-    def _calculate_cache_interval(self, total_messages: int) -> int:
+    def _add_system_cache_control(
+        self, content: str | list[dict[str, Any]]
+    ) -> str | list[dict[str, Any]]:
+        if not isinstance(content, str):
+            return self._add_cache_control_to_content(content)
+
+        # Everything before the per-agent prompt modules is identical across agents
+        # of the same type, so give it its own breakpoint to share that prefix.
+        shared, boundary, specific = content.partition(_SHARED_PROMPT_BOUNDARY)
+        if not boundary or not shared.strip():
+            return self._add_cache_control_to_content(content)
+
+        return [
+            {"type": "text", "text": shared, "cache_control": _EPHEMERAL_CACHE_CONTROL},
+            {
+                "type": "text",
+                "text": boundary + specific,
+                "cache_control": _EPHEMERAL_CACHE_CONTROL,
+            },
+        ]
+
+    def _calculate_cache_interval(self, total_messages: int, max_cached_messages: int = 3) -> int:
         if total_messages <= 1:
             return 10
 
-        max_cached_messages = 3
+        # Smallest multiple of 10 that yields at most max_cached_messages cache points.
         non_system_messages = total_messages - 1
-
-        interval = 10
-        while non_system_messages // interval > max_cached_messages:
-            interval += 10
-
-        return interval
+        return 10 * (non_system_messages // (10 * (max_cached_messages + 1)) + 1)
 
     def _prepare_cached_messages(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        if (
-            not self.config.enable_prompt_caching
-            or not supports_prompt_caching(self.config.model_name)
-            or not messages
-        ):
-            return messages
-
-        if not self._is_anthropic_model():
+        if not self._caching_on or not messages:
             return messages
 
         cached_messages = list(messages)
+        max_cached_messages = 3
 
-        if cached_messages and cached_messages[0].get("role") == "system":
-            system_message = cached_messages[0].copy()
-            system_message["content"] = self._add_cache_control_to_content(
-                system_message["content"]
+        if messages[0].get("role") == "system":
+            system_content = self._add_system_cache_control(messages[0]["content"])
+            cached_messages[0] = {**messages[0], "content": system_content}
+            system_breakpoints = sum(
+                1
+                for block in system_content
+                if isinstance(block, dict) and "cache_control" in block
+            )
+            max_cached_messages = min(
+                max_cached_messages, _MAX_CACHE_BREAKPOINTS - max(system_breakpoints, 1)
             )
-            cached_messages[0] = system_message
-
-        total_messages = len(cached_messages)
-        if total_messages > 1:
-            interval = self._calculate_cache_interval(total_messages)
-
-            cached_count = 0
-            for i in range(interval, total_messages, interval):
-                if cached_count >= 3:
-                    break
 
-                if i < len(cached_messages):
-                    message = cached_messages[i].copy()
-                    message["content"] = self._add_cache_control_to_content(message["content"])
-                    cached_messages[i] = message
-                    cached_count += 1
+        total_messages = len(messages)
+        interval = self._calculate_cache_interval(total_messages, max_cached_messages)
+        for i in range(interval, total_messages, interval)[:max_cached_messages]:
+            message = messages[i]
+            cached_messages[i] = {
+                **message,
+                "content": self._add_cache_control_to_content(message["content"]),
+            }
 
         return cached_messages
 
-    async def generate(  # noqa: PLR0912, PLR0915
+    async def generate(
         self,
         conversation_history: list[dict[str, Any]],
         scan_id: str | None = None,
         step_number: int = 1,
     ) -> LLMResponse:
-        messages = [{"role": "system", "content": self.system_prompt}]
+        compressed_history = self.memory_compressor.compress_history(conversation_history)
+        if compressed_history is not conversation_history:
+            conversation_history[:] = compressed_history
 
         identity_message = self._build_identity_message()
-        if identity_message:
-            messages.append(identity_message)
-
-        compressed_history = list(self.memory_compressor.compress_history(conversation_history))
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            *([identity_message] if identity_message else []),
+        ]
 
-        conversation_history.clear()
-        conversation_history.extend(compressed_history)
-        messages.extend(compressed_history)
+        history = compressed_history
+        if self.config.deduplicate_history:
+            history = self._deduplicate_history(compressed_history, offset=len(messages))
+        messages.extend(history)
 
         cached_messages = self._prepare_cached_messages(messages)
 
@@ -306,7 +451,7 @@ class LLM:
                 message = response.choices[0].message
                 content = getattr(message, "content", "") or ""
 
-                if self._should_include_reasoning_effort():
+                if self._include_reasoning:
                     raw_thinking = getattr(message, "thinking_blocks", None)
                     if raw_thinking:
                         thinking_blocks = [
@@ -319,11 +464,8 @@ class LLM:
                             if isinstance(block, dict) and block.get("signature")
                         ]
 
-            content = _truncate_to_first_function(content)
-
-            if "</function>" in content:
-                function_end_index = content.find("</function>") + len("</function>")
-                content = content[:function_end_index]
+            head, function_end, _ = content.partition("</function>")
+            content = _truncate_to_first_function(head + function_end)
 
             tool_invocations = parse_tool_invocations(content)
 
@@ -336,50 +478,10 @@ class LLM:
                 thinking_blocks=thinking_blocks,
             )
 
-        except litellm.RateLimitError as e:
-            raise LLMRequestFailedError("LLM request failed: Rate limit exceeded", str(e)) from e
-        except litellm.AuthenticationError as e:
-            raise LLMRequestFailedError("LLM request failed: Invalid API key", str(e)) from e
-        except litellm.NotFoundError as e:
-            raise LLMRequestFailedError("LLM request failed: Model not found", str(e)) from e
-        except litellm.ContextWindowExceededError as e:
-            raise LLMRequestFailedError("LLM request failed: Context too long", str(e)) from e
-        except litellm.ContentPolicyViolationError as e:
-            raise LLMRequestFailedError(
-                "LLM request failed: Content policy violation", str(e)
-            ) from e
-        except litellm.ServiceUnavailableError as e:
-            raise LLMRequestFailedError("LLM request failed: Service unavailable", str(e)) from e
-        except litellm.Timeout as e:
-            raise LLMRequestFailedError("LLM request failed: Request timed out", str(e)) from e
-        except litellm.UnprocessableEntityError as e:
-            raise LLMRequestFailedError("LLM request failed: Unprocessable entity", str(e)) from e
-        except litellm.InternalServerError as e:
-            raise LLMRequestFailedError("LLM request failed: Internal server error", str(e)) from e
-        except litellm.APIConnectionError as e:
-            raise LLMRequestFailedError("LLM request failed: Connection error", str(e)) from e
-        except litellm.UnsupportedParamsError as e:
-            raise LLMRequestFailedError("LLM request failed: Unsupported parameters", str(e)) from e
-        except litellm.BudgetExceededError as e:
-            raise LLMRequestFailedError("LLM request failed: Budget exceeded", str(e)) from e
-        except litellm.APIResponseValidationError as e:
-            raise LLMRequestFailedError(
-                "LLM request failed: Response validation error", str(e)
-            ) from e
-        except litellm.JSONSchemaValidationError as e:
+        except Exception as e:
             raise LLMRequestFailedError(
-                "LLM request failed: JSON schema validation error", str(e)
+                f"LLM request failed: {_describe_llm_error(e)}", str(e)
             ) from e
-        except litellm.InvalidRequestError as e:
-            raise LLMRequestFailedError("LLM request failed: Invalid request", str(e)) from e
-        except litellm.BadRequestError as e:
-            raise LLMRequestFailedError("LLM request failed: Bad request", str(e)) from e
-        except litellm.APIError as e:
-            raise LLMRequestFailedError("LLM request failed: API error", str(e)) from e
-        except litellm.OpenAIError as e:
-            raise LLMRequestFailedError("LLM request failed: OpenAI error", str(e)) from e
-        except Exception as e:
-            raise LLMRequestFailedError(f"LLM request failed: {type(e).__name__}", str(e)) from e
 
     @property
     def usage_stats(self) -> dict[str, dict[str, int | float]]:
@@ -391,20 +493,20 @@ class LLM:
     def get_cache_config(self) -> dict[str, bool]:
         return {
             "enabled": self.config.enable_prompt_caching,
-            "supported": supports_prompt_caching(self.config.model_name),
+            "supported": self._supports_prompt_caching,
         }
 
     def _should_include_stop_param(self) -> bool:
         if not self.config.model_name:
             return True
 
-        return not model_matches(self.config.model_name, SUPPORTS_STOP_WORDS_FALSE_PATTERNS)
+        return not model_matches(self.config.model_name, _STOP_WORDS_FALSE_MATCHER)
 
     def _should_include_reasoning_effort(self) -> bool:
         if not self.config.model_name:
             return False
 
-        return model_matches(self.config.model_name, REASONING_EFFORT_PATTERNS)
+        return model_matches(self.config.model_name, _REASONING_EFFORT_MATCHER)
 
     def _model_supports_vision(self) -> bool:
         if not self.config.model_name:
@@ -418,50 +520,40 @@ class LLM:
         filtered_messages = []
         for msg in messages:
             content = msg.get("content")
-            updated_msg = msg
-            if isinstance(content, list):
-                filtered_content = []
-                for item in content:
-                    if isinstance(item, dict):
-                        if item.get("type") == "image_url":
-                            filtered_content.append(
-                                {
-                                    "type": "text",
-                                    "text": "[Screenshot removed - model does not support vision. Use view_source or execute_js instead.]",
-                                }
-                            )
-                        else:
-                            filtered_content.append(item)
-                    else:
-                        filtered_content.append(item)
-                if filtered_content:
-                    text_parts = [
-                        item.get("text", "") if isinstance(item, dict) else str(item)
-                        for item in filtered_content
-                    ]
-                    all_text = all(
-                        isinstance(item, dict) and item.get("type") == "text"
-                        for item in filtered_content
-                    )
-                    if all_text:
-                        updated_msg = {**msg, "content": "\n".join(text_parts)}
-                    else:
-                        updated_msg = {**msg, "content": filtered_content}
+            if not isinstance(content, list):
+                filtered_messages.append(msg)
+                continue
+
+            text_parts: list[str] = []
+            filtered_content: list[Any] = []
+            saw_non_text = False
+            replaced_image = False
+            for item in content:
+                if not isinstance(item, dict):
+                    saw_non_text = True
+                    filtered_content.append(item)
+                elif item.get("type") == "image_url":
+                    replaced_image = True
+                    text_parts.append(_IMAGE_REMOVED_TEXT)
+                    filtered_content.append({"type": "text", "text": _IMAGE_REMOVED_TEXT})
                 else:
-                    updated_msg = {**msg, "content": ""}
-            filtered_messages.append(updated_msg)
-        return filtered_messages
+                    if item.get("type") == "text":
+                        text_parts.append(item.get("text", ""))
+                    else:
+                        saw_non_text = True
+                    filtered_content.append(item)
 
-    async def _make_request(
-        self,
-        messages: list[dict[str, Any]],
-    ) -> ModelResponse:
-        if not self._model_supports_vision():
-            messages = self._filter_images_from_messages(messages)
+            if not saw_non_text:
+                filtered_messages.append({**msg, "content": "\n".join(text_parts)})
+            elif replaced_image:
+                filtered_messages.append({**msg, "content": filtered_content})
+            else:
+                filtered_messages.append(msg)
+        return filtered_messages
 
+    def _build_base_completion_args(self) -> dict[str, Any]:
         completion_args: dict[str, Any] = {
             "model": self.config.model_name,
-            "messages": messages,
             "timeout": self.config.timeout,
         }
 
@@ -470,15 +562,26 @@ class LLM:
         if _LLM_API_BASE:
             completion_args["api_base"] = _LLM_API_BASE
 
-        if self._should_include_stop_param():
+        if self._include_stop:
             completion_args["stop"] = ["</function>"]
 
-        if self._should_include_reasoning_effort():
+        if self._include_reasoning:
             completion_args["reasoning_effort"] = "high"
             # Anthropic requires temperature=1 when extended thinking is enabled
-            if self._is_anthropic_model():
+            if self._is_anthropic:
                 completion_args["temperature"] = 1
 
+        return completion_args
+
+    async def _make_request(
+        self,
+        messages: list[dict[str, Any]],
+    ) -> ModelResponse:
+        if not self._supports_vision:
+            messages = self._filter_images_from_messages(messages)
+
+        completion_args = {**self._base_completion_args, "messages": messages}
+
         queue = get_global_queue()
         response = await queue.make_request(completion_args)
 
@@ -489,21 +592,13 @@ class LLM:
 
     def _update_usage_stats(self, response: ModelResponse) -> None:
         try:
-            if hasattr(response, "usage") and response.usage:
-                input_tokens = getattr(response.usage, "prompt_tokens", 0)
-                output_tokens = getattr(response.usage, "completion_tokens", 0)
-
-                cached_tokens = 0
-                cache_creation_tokens = 0
-
-                if hasattr(response.usage, "prompt_tokens_details"):
-                    prompt_details = response.usage.prompt_tokens_details
-                    if hasattr(prompt_details, "cached_tokens"):
-                        cached_tokens = prompt_details.cached_tokens or 0
-
-                if hasattr(response.usage, "cache_creation_input_tokens"):
-                    cache_creation_tokens = response.usage.cache_creation_input_tokens or 0
-
+            usage = getattr(response, "usage", None)
+            if usage:
+                input_tokens = getattr(usage, "prompt_tokens", 0) or 0
+                output_tokens = getattr(usage, "completion_tokens", 0) or 0
+                prompt_details = getattr(usage, "prompt_tokens_details", None)
+                cached_tokens = getattr(prompt_details, "cached_tokens", 0) or 0
+                cache_creation_tokens = getattr(usage, "cache_creation_input_tokens", 0) or 0
             else:
                 input_tokens = 0
                 output_tokens = 0
@@ -529,10 +624,13 @@ class LLM:
             self._last_request_stats.cost = cost
 
             if cached_tokens > 0:
-                logger.info(f"Cache hit: {cached_tokens} cached tokens, {input_tokens} new tokens")
+                logger.info(
+                    "Cache hit: %d cached tokens, %d new tokens", cached_tokens, input_tokens
+                )
             if cache_creation_tokens > 0:
-                logger.info(f"Cache creation: {cache_creation_tokens} tokens written to cache")
+                logger.info("Cache creation: %d tokens written to cache", cache_creation_tokens)
 
-            logger.info(f"Usage stats: {self.usage_stats}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Usage stats: %s", self.usage_stats)
         except Exception as e:  # noqa: BLE001
             logger.warning(f"Failed to update usage stats: {e}")
@@ -3,10 +3,11 @@ import logging
 import os
 import threading
 import time
+from concurrent.futures import Future
 from typing import Any
 
 import litellm
-from litellm import ModelResponse, completion
+from litellm import ModelResponse, batch_completion, completion
 from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 
@@ -26,8 +27,26 @@ def should_retry_exception(exception: Exception) -> bool:
     return True
 
 
+def _coalescing_key(completion_args: dict[str, Any]) -> tuple[tuple[str, str], ...]:
+    return tuple(
+        sorted((key, repr(value)) for key, value in completion_args.items() if key != "messages")
+    )
+
+
+_PendingRequest = tuple[dict[str, Any], Future[ModelResponse]]
+
+
+class _BatchAbandonedError(Exception):
+    """Set on coalesced requests left unsent when their batch leader is cancelled."""
+
+
 class LLMRequestQueue:
-    def __init__(self, max_concurrent: int = 1, delay_between_requests: float = 4.0):
+    def __init__(
+        self,
+        max_concurrent: int = 1,
+        delay_between_requests: float = 4.0,
+        coalesce_requests: bool = False,
+    ):
         rate_limit_delay = os.getenv("LLM_RATE_LIMIT_DELAY")
         if rate_limit_delay:
             delay_between_requests = float(rate_limit_delay)
@@ -36,17 +55,34 @@ class LLMRequestQueue:
         if rate_limit_concurrent:
             max_concurrent = int(rate_limit_concurrent)
 
+        request_coalescing = os.getenv("LLM_REQUEST_COALESCING")
+        if request_coalescing:
+            coalesce_requests = request_coalescing.lower() == "true"
+
         self.max_concurrent = max_concurrent
         self.delay_between_requests = delay_between_requests
+        self.coalesce_requests = coalesce_requests
         self._semaphore = threading.BoundedSemaphore(max_concurrent)
         self._last_request_time = 0.0
         self._lock = threading.Lock()
+        self._pending_batches: dict[tuple[tuple[str, str], ...], list[_PendingRequest]] = {}
+        self._batch_lock = threading.Lock()
 
     async def make_request(self, completion_args: dict[str, Any]) -> ModelResponse:
+        if self.coalesce_requests:
+            return await self._make_coalesced_request(completion_args)
+
+        await self._acquire_slot()
         try:
-            while not self._semaphore.acquire(timeout=0.2):
-                await asyncio.sleep(0.1)
+            return await self._reliable_request(completion_args)
+        finally:
+            self._semaphore.release()
+
+    async def _acquire_slot(self) -> None:
+        while not self._semaphore.acquire(timeout=0.2):
+            await asyncio.sleep(0.1)
 
+        try:
             with self._lock:
                 now = time.time()
                 time_since_last = now - self._last_request_time
@@ -55,10 +91,96 @@ class LLMRequestQueue:
 
             if sleep_needed > 0:
                 await asyncio.sleep(sleep_needed)
+        except BaseException:
+            self._semaphore.release()
+            raise
 
-            return await self._reliable_request(completion_args)
+    async def _make_coalesced_request(self, completion_args: dict[str, Any]) -> ModelResponse:
+        """Share one queue slot between concurrent requests with identical parameters.
+
+        The first caller for a given set of parameters waits for a slot as usual;
+        callers arriving while it waits join its batch instead of queueing on
+        their own. A caller that finds the queue idle is sent immediately.
+        """
+        key = _coalescing_key(completion_args)
+
+        while True:
+            future: Future[ModelResponse] = Future()
+
+            with self._batch_lock:
+                batch = self._pending_batches.setdefault(key, [])
+                is_leader = not batch
+                batch.append((completion_args, future))
+
+            if is_leader:
+                await self._dispatch_batch(key)
+
+            try:
+                return await asyncio.wrap_future(future)
+            except _BatchAbandonedError:
+                logger.debug("Re-queueing LLM request after its batch leader was cancelled")
+
+    async def _dispatch_batch(self, key: tuple[tuple[str, str], ...]) -> None:
+        batch: list[_PendingRequest] | None = None
+        try:
+            await self._acquire_slot()
+            try:
+                with self._batch_lock:
+                    batch = self._pending_batches.pop(key)
+                # Drops requests whose caller was cancelled while waiting; the rest are
+                # marked running, so a later cancellation cannot race their result
+                sendable = [
+                    (args, future)
+                    for args, future in batch
+                    if future.set_running_or_notify_cancel()
+                ]
+                if sendable:
+                    await self._run_batch(sendable)
+            finally:
+                self._semaphore.release()
         finally:
-            self._semaphore.release()
+            if batch is None:
+                with self._batch_lock:
+                    batch = self._pending_batches.pop(key)
+            # Only a cancelled or interrupted leader leaves requests unresolved; the
+            # callers still waiting on them queue up again instead of hanging
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(_BatchAbandonedError())
+
+    async def _run_batch(self, batch: list[_PendingRequest]) -> None:
+        if len(batch) == 1:
+            await self._resolve_with_retry(*batch[0])
+            return
+
+        logger.debug("Coalescing %d LLM requests into one batch", len(batch))
+        base_args = {key: value for key, value in batch[0][0].items() if key != "messages"}
+        try:
+            results = batch_completion(
+                messages=[args["messages"] for args, _ in batch], stream=False, **base_args
+            )
+        except Exception as e:  # noqa: BLE001
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (args, future), result in zip(batch, results, strict=True):
+            if isinstance(result, ModelResponse):
+                future.set_result(result)
+            elif isinstance(result, Exception) and should_retry_exception(result):
+                await self._resolve_with_retry(args, future)
+            elif isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_exception(RuntimeError("Unexpected response type"))
+
+    async def _resolve_with_retry(
+        self, completion_args: dict[str, Any], future: Future[ModelResponse]
+    ) -> None:
+        try:
+            future.set_result(await self._reliable_request(completion_args))
+        except Exception as e:  # noqa: BLE001
+            future.set_exception(e)
 
     @retry(  # type: ignore[misc]
         stop=stop_after_attempt(3),
@@ -1,9 +1,12 @@
+from functools import cache
 from pathlib import Path
 
 from jinja2 import Environment
 
 
-def get_available_prompt_modules() -> dict[str, list[str]]:
+# Prompt modules ship with the package, so the directory is only scanned once per process
+@cache
+def _discover_prompt_modules() -> dict[str, tuple[str, ...]]:
     modules_dir = Path(__file__).parent
     available_modules = {}
 
@@ -17,20 +20,28 @@ def get_available_prompt_modules() -> dict[str, list[str]]:
                 modules.append(module_name)
 
             if modules:
-                available_modules[category_name] = sorted(modules)
+                available_modules[category_name] = tuple(sorted(modules))
 
     return available_modules
 
 
+@cache
+def _all_module_names() -> frozenset[str]:
+    return frozenset(
+        module for modules in _discover_prompt_modules().values() for module in modules
+    )
+
+
+def get_available_prompt_modules() -> dict[str, list[str]]:
+    return {category: list(modules) for category, modules in _discover_prompt_modules().items()}
+
+
 def get_all_module_names() -> set[str]:
-    all_modules = set()
-    for category_modules in get_available_prompt_modules().values():
-        all_modules.update(category_modules)
-    return all_modules
+    return set(_all_module_names())
 
 
 def validate_module_names(module_names: list[str]) -> dict[str, list[str]]:
-    available_modules = get_all_module_names()
+    available_modules = _all_module_names()
     valid_modules = []
     invalid_modules = []
 
@@ -44,12 +55,12 @@ def validate_module_names(module_names: list[str]) -> dict[str, list[str]]:
 
 
 def generate_modules_description() -> str:
-    available_modules = get_available_prompt_modules()
+    available_modules = _discover_prompt_modules()
 
     if not available_modules:
         return "No prompt modules available"
 
-    all_module_names = get_all_module_names()
+    all_module_names = _all_module_names()
 
     if not all_module_names:
         return "No prompt modules available"
@@ -76,7 +87,7 @@ def load_prompt_modules(module_names: list[str], jinja_env: Environment) -> dict
     module_content = {}
     prompts_dir = Path(__file__).parent
 
-    available_modules = get_available_prompt_modules()
+    available_modules = _discover_prompt_modules()
 
     for module_name in module_names:
         try:
@@ -1,9 +1,25 @@
 import os
+import threading
 
 from .runtime import AbstractRuntime
 
 
+_runtime: AbstractRuntime | None = None
+_runtime_lock = threading.Lock()
+
+
 def get_runtime() -> AbstractRuntime:
+    # One runtime per process, so the scan container and its liveness check are shared
+    # by every agent instead of being rediscovered on each call.
+    global _runtime  # noqa: PLW0603
+
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = _create_runtime()
+        return _runtime
+
+
+def _create_runtime() -> AbstractRuntime:
     runtime_backend = os.getenv("STRIX_RUNTIME_BACKEND", "docker")
 
     if runtime_backend == "docker":
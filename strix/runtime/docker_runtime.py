@@ -1,27 +1,120 @@
+import asyncio
 import contextlib
 import logging
 import os
+import random
 import secrets
 import socket
+import sys
+import tarfile
+import threading
 import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cache
 from pathlib import Path
-from typing import cast
+from typing import TYPE_CHECKING, Any, BinaryIO, ClassVar, cast
+from urllib.parse import urlparse
 
 import docker
+import httpx
 from docker.errors import DockerException, ImageNotFound, NotFound
 from docker.models.containers import Container
 
 from .runtime import AbstractRuntime, SandboxInfo
 
 
+if TYPE_CHECKING:
+    from strix.telemetry.tracer import Tracer
+
+
 STRIX_IMAGE = os.getenv("STRIX_IMAGE", "ghcr.io/usestrix/strix-sandbox:0.1.10")
+# Host networking skips docker-proxy but shares the host's network namespace with a
+# container holding NET_ADMIN, so it is opt-in and only honoured on Linux.
+_USE_HOST_NETWORK = (
+    sys.platform.startswith("linux")
+    and os.getenv("STRIX_DOCKER_HOST_NETWORK", "false").lower() == "true"
+)
 logger = logging.getLogger(__name__)
 
+_IMAGE_CHECK_TIMEOUT = 60.0
+_READINESS_TIMEOUT = 15.0
+_READINESS_POLL_INTERVAL = 0.05
+_TAR_CHUNK_SIZE = 1024 * 1024
+_CAIDO_TOKEN_MARKER = "CAIDO_TOKEN:"  # noqa: S105
+
+_BACKOFF_BASE = 0.5
+_BACKOFF_CAP = 4.0
+_FAILURE_WINDOW = 60.0
+_recent_failures: deque[float] = deque()
+_recent_failures_lock = threading.Lock()
+
+_DOCKER_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="strix-docker")
+
+
+@cache
+def _shared_docker_client() -> docker.DockerClient:
+    return docker.from_env()
+
+
+@cache
+def _tracer_getter() -> Callable[[], "Tracer | None"] | None:
+    try:
+        from strix.telemetry.tracer import get_global_tracer
+    except ImportError:
+        logger.debug("Failed to import tracer, using fallback scan ID")
+        return None
+    return get_global_tracer
+
+
+def _retry_delay() -> float:
+    # Jittered and capped, growing with the failures seen recently by any runtime in
+    # the process, so concurrent scans retrying against a busy daemon spread out.
+    now = time.monotonic()
+    with _recent_failures_lock:
+        _recent_failures.append(now)
+        while now - _recent_failures[0] > _FAILURE_WINDOW:
+            _recent_failures.popleft()
+        failures = len(_recent_failures)
+
+    base = _BACKOFF_BASE * failures
+    return min(_BACKOFF_CAP, base * (1 + random.random()))  # nosec B311 # noqa: S311
+
+
+@cache
+def _resolve_docker_host() -> str:
+    docker_host = os.getenv("DOCKER_HOST", "")
+    if not docker_host:
+        return "127.0.0.1"
+
+    parsed = urlparse(docker_host)
+
+    if parsed.scheme in ("tcp", "http", "https") and parsed.hostname:
+        return parsed.hostname
+
+    return "127.0.0.1"
+
+
+def _iter_tree(root: str) -> Iterator[str]:
+    pending = [root]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                    yield entry.path
+                elif entry.is_file():
+                    yield entry.path
+
 
 class DockerRuntime(AbstractRuntime):
+    _image_ready: ClassVar[Future[None] | None] = None
+    _image_ready_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(self) -> None:
         try:
-            self.client = docker.from_env()
+            self.client = _shared_docker_client()
         except DockerException as e:
             logger.exception("Failed to connect to Docker daemon")
             raise RuntimeError("Docker is not available or not configured correctly.") from e
@@ -29,28 +122,55 @@ class DockerRuntime(AbstractRuntime):
         self._scan_container: Container | None = None
         self._tool_server_port: int | None = None
         self._tool_server_token: str | None = None
+        self._last_reload_ts = 0.0
+        self._reload_ttl = 5.0
+        self._container_lock = threading.Lock()
+        self._docker_host = _resolve_docker_host()
+
+        self._check_image_in_background()
+
+    def _check_image_in_background(self, refresh: bool = False) -> Future[None]:
+        # Shared by all runtimes in the process so the image check overlaps whatever
+        # happens before the first sandbox is created, and only reruns after a failure.
+        with DockerRuntime._image_ready_lock:
+            image_ready = DockerRuntime._image_ready
+            if refresh or image_ready is None:
+                image_ready = _DOCKER_EXECUTOR.submit(self._verify_image_available, STRIX_IMAGE)
+                DockerRuntime._image_ready = image_ready
+            return image_ready
 
     def _generate_sandbox_token(self) -> str:
         return secrets.token_urlsafe(32)
 
-    def _find_available_port(self) -> int:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+    def _find_available_port(self) -> tuple[int, socket.socket]:
+        # On Linux the socket stays bound (but not listening) until Docker publishes the
+        # port, so nothing else can take it in between. SO_REUSEADDR lets Docker bind it too.
+        # Bind the wildcard address: Docker publishes on 0.0.0.0, and a loopback-only
+        # reservation would not conflict with holders of the port on other interfaces.
+        # IP_BIND_ADDRESS_NO_PORT is not usable here since it defers the port choice
+        # until connect(), leaving getsockname() with port 0.
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if hasattr(socket, "SO_REUSEPORT"):
+                s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
             s.bind(("", 0))
-            return cast("int", s.getsockname()[1])
+        except OSError:
+            s.close()
+            raise
+        return cast("int", s.getsockname()[1]), s
 
     def _get_scan_id(self, agent_id: str) -> str:
-        try:
-            from strix.telemetry.tracer import get_global_tracer
-
-            tracer = get_global_tracer()
-            if tracer and tracer.scan_config:
-                return str(tracer.scan_config.get("scan_id", "default-scan"))
-        except ImportError:
-            logger.debug("Failed to import tracer, using fallback scan ID")
-        except AttributeError:
-            logger.debug("Tracer missing scan_config, using fallback scan ID")
+        get_tracer = _tracer_getter()
+        if get_tracer is not None:
+            try:
+                tracer = get_tracer()
+                if tracer and tracer.scan_config:
+                    return str(tracer.scan_config.get("scan_id", "default-scan"))
+            except AttributeError:
+                logger.debug("Tracer missing scan_config, using fallback scan ID")
 
-        return f"scan-{agent_id.split('-')[0]}"
+        return f"scan-{agent_id.split('-', 1)[0]}"
 
     def _verify_image_available(self, image_name: str, max_retries: int = 3) -> None:
         def _validate_image(image: docker.models.images.Image) -> None:
@@ -66,64 +186,89 @@ class DockerRuntime(AbstractRuntime):
                     logger.exception(f"Image {image_name} not found after {max_retries} attempts")
                     raise
                 logger.warning(f"Image {image_name} not ready, attempt {attempt + 1}/{max_retries}")
-                time.sleep(2**attempt)
+                time.sleep(_retry_delay())
             except DockerException:
                 if attempt == max_retries - 1:
                     logger.exception(f"Failed to verify image {image_name}")
                     raise
                 logger.warning(f"Docker error verifying image, attempt {attempt + 1}/{max_retries}")
-                time.sleep(2**attempt)
+                time.sleep(_retry_delay())
             else:
                 logger.debug(f"Image {image_name} verified as available")
                 return
 
+    def _remove_existing_container(self, container_name: str) -> None:
+        try:
+            existing_container = self.client.containers.get(container_name)
+            logger.warning(f"Container {container_name} already exists, removing it")
+            with contextlib.suppress(Exception):
+                existing_container.stop(timeout=5)
+            existing_container.remove(force=True)
+            # Poll until the daemon no longer knows the name; NotFound ends the wait.
+            for _ in range(40):
+                self.client.containers.get(container_name)
+                time.sleep(0.05)
+        except NotFound:
+            pass
+        except DockerException as e:
+            logger.warning(f"Error checking/removing existing container: {e}")
+
+    def _network_options(
+        self, scan_id: str, caido_port: int, tool_server_port: int
+    ) -> dict[str, Any]:
+        if _USE_HOST_NETWORK:
+            return {"network_mode": "host"}
+        return {
+            "hostname": f"strix-scan-{scan_id}",
+            "ports": {
+                f"{caido_port}/tcp": caido_port,
+                f"{tool_server_port}/tcp": tool_server_port,
+            },
+        }
+
     def _create_container_with_retry(self, scan_id: str, max_retries: int = 3) -> Container:
         last_exception = None
         container_name = f"strix-scan-{scan_id}"
 
         for attempt in range(max_retries):
             try:
-                self._verify_image_available(STRIX_IMAGE)
-
-                try:
-                    existing_container = self.client.containers.get(container_name)
-                    logger.warning(f"Container {container_name} already exists, removing it")
-                    with contextlib.suppress(Exception):
-                        existing_container.stop(timeout=5)
-                    existing_container.remove(force=True)
-                    time.sleep(1)
-                except NotFound:
-                    pass
-                except DockerException as e:
-                    logger.warning(f"Error checking/removing existing container: {e}")
-
-                caido_port = self._find_available_port()
-                tool_server_port = self._find_available_port()
-                tool_server_token = self._generate_sandbox_token()
-
-                self._tool_server_port = tool_server_port
-                self._tool_server_token = tool_server_token
-
-                container = self.client.containers.run(
-                    STRIX_IMAGE,
-                    command="sleep infinity",
-                    detach=True,
-                    name=container_name,
-                    hostname=f"strix-scan-{scan_id}",
-                    ports={
-                        f"{caido_port}/tcp": caido_port,
-                        f"{tool_server_port}/tcp": tool_server_port,
-                    },
-                    cap_add=["NET_ADMIN", "NET_RAW"],
-                    labels={"strix-scan-id": scan_id},
-                    environment={
-                        "PYTHONUNBUFFERED": "1",
-                        "CAIDO_PORT": str(caido_port),
-                        "TOOL_SERVER_PORT": str(tool_server_port),
-                        "TOOL_SERVER_TOKEN": tool_server_token,
-                    },
-                    tty=True,
-                )
+                image_check = self._check_image_in_background(refresh=attempt > 0)
+                cleanup = _DOCKER_EXECUTOR.submit(self._remove_existing_container, container_name)
+
+                with contextlib.ExitStack() as reserved_ports:
+                    caido_port, caido_socket = self._find_available_port()
+                    reserved_ports.enter_context(caido_socket)
+                    tool_server_port, tool_server_socket = self._find_available_port()
+                    reserved_ports.enter_context(tool_server_socket)
+                    tool_server_token = self._generate_sandbox_token()
+
+                    cleanup.result()
+                    image_check.result(timeout=_IMAGE_CHECK_TIMEOUT)
+
+                    self._tool_server_port = tool_server_port
+                    self._tool_server_token = tool_server_token
+
+                    # Address reuse only lets Docker bind a held port on Linux; Docker Desktop
+                    # publishes through its own VM and would collide with the reservation.
+                    if not sys.platform.startswith("linux"):
+                        reserved_ports.close()
+
+                    container = self.client.containers.run(
+                        STRIX_IMAGE,
+                        command="sleep infinity",
+                        detach=True,
+                        name=container_name,
+                        **self._network_options(scan_id, caido_port, tool_server_port),
+                        cap_add=["NET_ADMIN", "NET_RAW"],
+                        labels={"strix-scan-id": scan_id},
+                        environment={
+                            "PYTHONUNBUFFERED": "1",
+                            "CAIDO_PORT": str(caido_port),
+                            "TOOL_SERVER_PORT": str(tool_server_port),
+                            "TOOL_SERVER_TOKEN": tool_server_token,
+                        },
+                        tty=True,
+                    )
 
                 self._scan_container = container
                 logger.info("Created container %s for scan %s", container.id, scan_id)
@@ -131,7 +276,7 @@ class DockerRuntime(AbstractRuntime):
                 self._initialize_container(
                     container, caido_port, tool_server_port, tool_server_token
                 )
-            except DockerException as e:
+            except (DockerException, TimeoutError) as e:
                 last_exception = e
                 if attempt == max_retries - 1:
                     logger.exception(f"Failed to create container after {max_retries} attempts")
@@ -142,8 +287,7 @@ class DockerRuntime(AbstractRuntime):
                 self._tool_server_port = None
                 self._tool_server_token = None
 
-                sleep_time = (2**attempt) + (0.1 * attempt)
-                time.sleep(sleep_time)
+                time.sleep(_retry_delay())
             else:
                 return container
 
@@ -151,22 +295,44 @@ class DockerRuntime(AbstractRuntime):
             f"Failed to create Docker container after {max_retries} attempts: {last_exception}"
         ) from last_exception
 
-    def _get_or_create_scan_container(self, scan_id: str) -> Container:  # noqa: PLR0912
+    def _read_tool_server_env(self, container: Container) -> None:
+        env = dict(
+            env_var.split("=", 1)
+            for env_var in container.attrs.get("Config", {}).get("Env") or []
+            if "=" in env_var
+        )
+        port = env.get("TOOL_SERVER_PORT")
+        self._tool_server_port = int(port) if port else None
+        self._tool_server_token = env.get("TOOL_SERVER_TOKEN")
+
+    def _get_or_create_scan_container(self, scan_id: str) -> Container:
+        # Agents share one runtime, so only one of them looks up or creates the container.
+        with self._container_lock:
+            return self._find_or_create_scan_container(scan_id)
+
+    def _find_or_create_scan_container(self, scan_id: str) -> Container:
         container_name = f"strix-scan-{scan_id}"
 
         if self._scan_container:
+            if (
+                self._tool_server_port
+                and time.monotonic() - self._last_reload_ts < self._reload_ttl
+            ):
+                return self._scan_container
             try:
-                self._scan_container.reload()
-                if self._scan_container.status == "running":
+                info = self.client.api.inspect_container(self._scan_container.id)
+                if info["State"]["Status"] == "running":
+                    self._last_reload_ts = time.monotonic()
                     return self._scan_container
             except NotFound:
                 self._scan_container = None
                 self._tool_server_port = None
                 self._tool_server_token = None
 
+        found = False
         try:
             container = self.client.containers.get(container_name)
-            container.reload()
+            found = True
 
             if (
                 "strix-scan-id" not in container.labels
@@ -182,38 +348,32 @@ class DockerRuntime(AbstractRuntime):
                 time.sleep(2)
 
             self._scan_container = container
-
-            for env_var in container.attrs["Config"]["Env"]:
-                if env_var.startswith("TOOL_SERVER_PORT="):
-                    self._tool_server_port = int(env_var.split("=")[1])
-                elif env_var.startswith("TOOL_SERVER_TOKEN="):
-                    self._tool_server_token = env_var.split("=")[1]
+            self._read_tool_server_env(container)
 
             logger.info(f"Reusing existing container {container_name}")
 
         except NotFound:
             pass
         except DockerException as e:
+            found = False
             logger.warning(f"Failed to get container by name {container_name}: {e}")
-        else:
+
+        if found:
             return container
 
         try:
-            containers = self.client.containers.list(
+            # Sparse listing avoids inspecting every match; only the chosen one is fetched.
+            summaries = self.client.api.containers(
                 all=True, filters={"label": f"strix-scan-id={scan_id}"}
             )
-            if containers:
-                container = containers[0]
+            if summaries:
+                summary = next((c for c in summaries if c.get("State") == "running"), summaries[0])
+                container = self.client.containers.get(summary["Id"])
                 if container.status != "running":
                     container.start()
                     time.sleep(2)
                 self._scan_container = container
-
-                for env_var in container.attrs["Config"]["Env"]:
-                    if env_var.startswith("TOOL_SERVER_PORT="):
-                        self._tool_server_port = int(env_var.split("=")[1])
-                    elif env_var.startswith("TOOL_SERVER_TOKEN="):
-                        self._tool_server_token = env_var.split("=")[1]
+                self._read_tool_server_env(container)
 
                 logger.info(f"Found existing container by label for scan {scan_id}")
                 return container
@@ -228,16 +388,12 @@ class DockerRuntime(AbstractRuntime):
     ) -> None:
         logger.info("Initializing Caido proxy on port %s", caido_port)
         result = container.exec_run(
-            f"bash -c 'export CAIDO_PORT={caido_port} && /usr/local/bin/docker-entrypoint.sh true'",
-            detach=False,
-        )
-
-        time.sleep(5)
-
-        result = container.exec_run(
-            "bash -c 'source /etc/profile.d/proxy.sh && echo $CAIDO_API_TOKEN'", user="pentester"
+            f"bash -c 'export CAIDO_PORT={caido_port} && /usr/local/bin/docker-entrypoint.sh true; "
+            f'source /etc/profile.d/proxy.sh && echo "{_CAIDO_TOKEN_MARKER}$CAIDO_API_TOKEN"\'',
+            user="pentester",
         )
-        caido_token = result.output.decode().strip() if result.exit_code == 0 else ""
+        _, marker, caido_token = result.output.decode().rpartition(_CAIDO_TOKEN_MARKER)
+        caido_token = caido_token.strip() if marker else ""
 
         container.exec_run(
             f"bash -c 'source /etc/profile.d/proxy.sh && cd /app && "
@@ -248,19 +404,110 @@ class DockerRuntime(AbstractRuntime):
             user="pentester",
         )
 
-        time.sleep(5)
+        self._wait_for_tool_server(tool_server_port)
 
-    def _copy_local_directory_to_container(
-        self, container: Container, local_path: str, target_name: str | None = None
+    def _wait_for_tool_server(self, port: int, timeout: float = _READINESS_TIMEOUT) -> None:
+        health_url = f"http://{self._docker_host}:{port}/health"
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if httpx.get(health_url, timeout=1.0, trust_env=False).is_success:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(_READINESS_POLL_INTERVAL)
+
+        logger.warning(f"Tool server on port {port} not ready after {timeout}s")
+
+    def _write_directory_tar(
+        self,
+        fileobj: BinaryIO,
+        local_path_obj: Path,
+        target_name: str | None,
+        owner: tuple[int, int] | None = None,
+    ) -> None:
+        def set_owner(info: tarfile.TarInfo) -> tarfile.TarInfo:
+            if owner is not None:
+                info.uid, info.gid = owner
+                info.uname = info.gname = "pentester"
+                info.mode = 0o755
+            return info
+
+        root = str(local_path_obj)
+        prefix_len = len(root) + 1
+        with tarfile.open(fileobj=fileobj, mode="w|", bufsize=_TAR_CHUNK_SIZE) as tar:
+            if target_name and owner is not None:
+                tar.add(root, arcname=target_name, recursive=False, filter=set_owner)
+            for path in _iter_tree(root):
+                rel_path = path[prefix_len:]
+                arcname = f"{target_name}/{rel_path}" if target_name else rel_path
+                tar.add(path, arcname=arcname, recursive=False, filter=set_owner)
+
+    def _stream_directory_to_container(
+        self,
+        container: Container,
+        local_path_obj: Path,
+        target_name: str | None,
+        owner: tuple[int, int] | None = None,
     ) -> None:
-        import tarfile
-        from io import BytesIO
+        read_fd, write_fd = os.pipe()
+        writer_errors: list[BaseException] = []
 
+        def write_archive() -> None:
+            try:
+                with os.fdopen(write_fd, "wb") as pipe_writer:
+                    self._write_directory_tar(pipe_writer, local_path_obj, target_name, owner)
+            except BaseException as e:  # noqa: BLE001
+                writer_errors.append(e)
+
+        writer = threading.Thread(target=write_archive, name="strix-tar-writer", daemon=True)
+
+        def read_archive() -> Iterator[bytes]:
+            while chunk := pipe_reader.read(_TAR_CHUNK_SIZE):
+                yield chunk
+            # The pipe also reaches EOF when the writer fails partway. Fail the upload
+            # instead of ending it cleanly so Docker never extracts a truncated archive.
+            writer.join()
+            if writer_errors:
+                raise writer_errors[0]
+
+        put_error: BaseException | None = None
+        with os.fdopen(read_fd, "rb") as pipe_reader:
+            writer.start()
+            try:
+                container.put_archive("/workspace", read_archive())
+            except BaseException as e:  # noqa: BLE001
+                put_error = e
+            finally:
+                pipe_reader.close()
+                writer.join()
+
+        if put_error is not None:
+            writer_error = writer_errors[0] if writer_errors else None
+            # A broken pipe only means the upload stopped reading; anything else from the
+            # writer is the root cause of the failed upload
+            if (
+                writer_error is not None
+                and writer_error is not put_error
+                and (not isinstance(writer_error, BrokenPipeError))
+            ):
+                raise put_error from writer_error
+            raise put_error
+        if writer_errors:
+            raise writer_errors[0]
+
+    def _copy_local_directory_to_container(
+        self,
+        container: Container,
+        local_path: str,
+        target_name: str | None = None,
+        owner: tuple[int, int] | None = None,
+    ) -> bool:
         try:
             local_path_obj = Path(local_path).resolve()
             if not local_path_obj.exists() or not local_path_obj.is_dir():
                 logger.warning(f"Local path does not exist or is not directory: {local_path_obj}")
-                return
+                return False
 
             if target_name:
                 logger.info(
@@ -269,26 +516,72 @@ class DockerRuntime(AbstractRuntime):
             else:
                 logger.info(f"Copying local directory {local_path_obj} to container")
 
-            tar_buffer = BytesIO()
-            with tarfile.open(fileobj=tar_buffer, mode="w") as tar:
-                for item in local_path_obj.rglob("*"):
-                    if item.is_file():
-                        rel_path = item.relative_to(local_path_obj)
-                        arcname = Path(target_name) / rel_path if target_name else rel_path
-                        tar.add(item, arcname=arcname)
-
-            tar_buffer.seek(0)
-            container.put_archive("/workspace", tar_buffer.getvalue())
-
-            container.exec_run(
-                "chown -R pentester:pentester /workspace && chmod -R 755 /workspace",
-                user="root",
-            )
+            self._stream_directory_to_container(container, local_path_obj, target_name, owner)
 
             logger.info("Successfully copied local directory to /workspace")
 
         except (OSError, DockerException):
             logger.exception("Failed to copy local directory to container")
+            return False
+        else:
+            return True
+
+    def _copy_local_sources_to_container(
+        self, container: Container, local_sources: list[dict[str, str]]
+    ) -> None:
+        copies: list[tuple[str, str]] = []
+        for index, source in enumerate(local_sources, start=1):
+            source_path = source.get("source_path")
+            if not source_path:
+                continue
+
+            target_name = source.get("workspace_subdir")
+            if not target_name:
+                target_name = Path(source_path).name or f"target_{index}"
+
+            copies.append((source_path, target_name))
+
+        if not copies:
+            return
+
+        owner = self._get_pentester_owner(container)
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(copies), 4), thread_name_prefix="strix-copy"
+        ) as pool:
+            copied = list(
+                pool.map(
+                    lambda copy: self._copy_local_directory_to_container(
+                        container, *copy, owner=owner
+                    ),
+                    copies,
+                )
+            )
+
+        if owner is None and any(copied):
+            try:
+                container.exec_run(
+                    "bash -c 'chown -R pentester:pentester /workspace && chmod -R 755 /workspace'",
+                    user="root",
+                )
+            except DockerException:
+                logger.exception("Failed to set ownership of copied sources")
+
+    def _get_pentester_owner(self, container: Container) -> tuple[int, int] | None:
+        try:
+            result = container.exec_run("bash -c 'id -u pentester && id -g pentester'")
+        except DockerException as e:
+            logger.warning(f"Failed to look up pentester uid/gid: {e}")
+            return None
+
+        if result.exit_code != 0:
+            return None
+
+        try:
+            uid, gid = (int(value) for value in result.output.decode().split())
+        except ValueError:
+            return None
+        return uid, gid
 
     async def create_sandbox(
         self,
@@ -301,16 +594,9 @@ class DockerRuntime(AbstractRuntime):
 
         source_copied_key = f"_source_copied_{scan_id}"
         if local_sources and not hasattr(self, source_copied_key):
-            for index, source in enumerate(local_sources, start=1):
-                source_path = source.get("source_path")
-                if not source_path:
-                    continue
-
-                target_name = source.get("workspace_subdir")
-                if not target_name:
-                    target_name = Path(source_path).name or f"target_{index}"
-
-                self._copy_local_directory_to_container(container, source_path, target_name)
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._copy_local_sources_to_container, container, local_sources
+            )
             setattr(self, source_copied_key, True)
 
         container_id = container.id
@@ -337,8 +623,8 @@ class DockerRuntime(AbstractRuntime):
     async def _register_agent_with_tool_server(
         self, api_url: str, agent_id: str, token: str
     ) -> None:
-        import httpx
-
+        # Each agent runs on its own event loop and registers once, so a client shared
+        # across registrations would never be reused
         try:
             async with httpx.AsyncClient(trust_env=False) as client:
                 response = await client.post(
@@ -348,37 +634,19 @@ class DockerRuntime(AbstractRuntime):
                     timeout=30,
                 )
                 response.raise_for_status()
-                logger.info(f"Registered agent {agent_id} with tool server")
+            logger.info(f"Registered agent {agent_id} with tool server")
         except (httpx.RequestError, httpx.HTTPStatusError) as e:
             logger.warning(f"Failed to register agent {agent_id}: {e}")
 
     async def get_sandbox_url(self, container_id: str, port: int) -> str:
         try:
-            container = self.client.containers.get(container_id)
-            container.reload()
-
-            host = self._resolve_docker_host()
-
+            self.client.api.inspect_container(container_id)
         except NotFound:
             raise ValueError(f"Container {container_id} not found.") from None
         except DockerException as e:
             raise RuntimeError(f"Failed to get container URL for {container_id}: {e}") from e
         else:
-            return f"http://{host}:{port}"
-
-    def _resolve_docker_host(self) -> str:
-        docker_host = os.getenv("DOCKER_HOST", "")
-        if not docker_host:
-            return "127.0.0.1"
-
-        from urllib.parse import urlparse
-
-        parsed = urlparse(docker_host)
-
-        if parsed.scheme in ("tcp", "http", "https") and parsed.hostname:
-            return parsed.hostname
-
-        return "127.0.0.1"
+            return f"http://{self._docker_host}:{port}"
 
     async def destroy_sandbox(self, container_id: str) -> None:
         logger.info("Destroying scan container %s", container_id)
@@ -388,9 +656,11 @@ class DockerRuntime(AbstractRuntime):
             container.remove()
             logger.info("Successfully destroyed container %s", container_id)
 
-            self._scan_container = None
-            self._tool_server_port = None
-            self._tool_server_token = None
+            with self._container_lock:
+                self._scan_container = None
+                self._tool_server_port = None
+                self._tool_server_token = None
+                self._last_reload_ts = 0.0
 
         except NotFound:
             logger.warning("Container %s not found for destruction.", container_id)
@@ -1,4 +1,4 @@
-from .tracer import Tracer, get_global_tracer, set_global_tracer
+from .tracer import ChatMessage, Tracer, get_global_tracer, set_global_tracer
 
 
-__all__ = ["Tracer", "get_global_tracer", "set_global_tracer"]
+__all__ = ["ChatMessage", "Tracer", "get_global_tracer", "set_global_tracer"]
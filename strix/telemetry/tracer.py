@@ -1,5 +1,17 @@
+import bisect
+import contextlib
+import csv
+import io
+import json
 import logging
+import os
+import tarfile
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime
+from functools import cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Optional
 from uuid import uuid4
@@ -11,9 +23,62 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_SAVE_INTERVAL = 2.0
+_REPORT_ARCHIVE_NAME = "reports.tar"
+_INFO_TOOLS = frozenset({"scan_start_info", "subagent_start_info"})
+_SEVERITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3, "info": 4}
+# Maps each known severity to one shared string object
+_SEVERITIES = {severity: severity for severity in _SEVERITY_RANK}
+
 _global_tracer: Optional["Tracer"] = None
 
 
+def _normalize_severity(severity: str) -> str:
+    severity = severity.lower().strip()
+    return _SEVERITIES.get(severity, severity)
+
+
+def _report_timestamp() -> str:
+    """Return the current UTC time as ``YYYY-MM-DD HH:MM:SS UTC``."""
+    return datetime.now(UTC).isoformat(sep=" ", timespec="seconds")[:19] + " UTC"
+
+
+@dataclass(slots=True)
+class ChatMessage:
+    message_id: int
+    content: str
+    role: str
+    agent_id: str | None
+    timestamp: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class _ReportSnapshot:
+    """Report state copied under the reports lock, written to disk outside it."""
+
+    dirty: set[str]
+    final_scan_result: str | None
+    new_vulnerabilities: list[dict[str, Any]]
+    # None when vulnerabilities.csv already lists every report
+    sorted_vulnerabilities: list[dict[str, Any]] | None
+    pending: list[dict[str, Any]]
+    pending_queued: int
+    rejected: list[dict[str, Any]]
+    manual_review: list[dict[str, Any]]
+
+
+@cache
+def _agent_instances() -> dict[str, Any]:
+    # Deferred: importing strix.tools loads every tool module
+    from strix.tools.agents_graph.agents_graph_actions import _agent_instances
+
+    return _agent_instances
+
+
 def get_global_tracer() -> Optional["Tracer"]:
     return _global_tracer
 
@@ -32,13 +97,21 @@ class Tracer:
 
         self.agents: dict[str, dict[str, Any]] = {}
         self.tool_executions: dict[int, dict[str, Any]] = {}
-        self.chat_messages: list[dict[str, Any]] = []
+        self._execution_ids_by_agent: dict[str, list[int]] = {}
+        self._real_tool_count = 0
+        self.chat_messages: list[ChatMessage] = []
 
         self.vulnerability_reports: list[dict[str, Any]] = []
-        self.pending_vulnerability_reports: list[dict[str, Any]] = []
+        # Keyed by report ID; dicts keep insertion order, so this doubles as the queue
+        self.pending_vulnerability_reports: dict[str, dict[str, Any]] = {}
         self.rejected_vulnerability_reports: list[dict[str, Any]] = []
         self.needs_manual_review_reports: list[dict[str, Any]] = []
         self.final_scan_result: str | None = None
+        self._resolved_report_ids: set[str] = set()
+        # (severity rank, timestamp, position in vulnerability_reports), kept sorted
+        self._sorted_vuln_index: list[tuple[int, str, int]] = []
+        # Number of reports listed in the last vulnerabilities.csv written
+        self._csv_report_count = 0
 
         self.scan_results: dict[str, Any] | None = None
         self.scan_config: dict[str, Any] | None = None
@@ -51,12 +124,23 @@ class Tracer:
             "status": "running",
         }
         self._run_dir: Path | None = None
+        self._report_dirs: dict[str, Path] = {}
+        self._archive_reports = os.getenv("STRIX_ARCHIVE_REPORTS", "false").lower() == "true"
         self._next_execution_id = 1
         self._next_message_id = 1
-        self._saved_vuln_ids: set[str] = set()
-        self._saved_pending_ids: set[str] = set()
-        self._saved_rejected_ids: set[str] = set()
-        self._saved_manual_review_ids: set[str] = set()
+        # Reports not yet written to disk, drained by save_run_data
+        self._unsaved_vuln_reports: deque[dict[str, Any]] = deque()
+        self._unsaved_pending_reports: deque[dict[str, Any]] = deque()
+        self._unsaved_rejected_reports: deque[dict[str, Any]] = deque()
+        self._unsaved_manual_review_reports: deque[dict[str, Any]] = deque()
+
+        self._dirty_sections: set[str] = set()
+        # Guards the report lists, the unsaved queues and the dirty sections, which agent
+        # threads mutate while the flush thread snapshots them
+        self._reports_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._stop_flushing = threading.Event()
+        self._flush_thread: threading.Thread | None = None
 
         self.vulnerability_found_callback: Callable[[str, str, str, str], None] | None = None
 
@@ -75,31 +159,85 @@ class Tracer:
 
         return self._run_dir
 
+    def _get_report_dir(self, name: str) -> Path:
+        report_dir = self._report_dirs.get(name)
+        if report_dir is None:
+            report_dir = self.get_run_dir() / name
+            report_dir.mkdir(exist_ok=True)
+            self._report_dirs[name] = report_dir
+        return report_dir
+
+    def _append_vulnerability_report(self, report: dict[str, Any]) -> None:
+        self.vulnerability_reports.append(report)
+        self._unsaved_vuln_reports.append(report)
+        self._resolved_report_ids.add(report["id"])
+        entry = (
+            _SEVERITY_RANK.get(report["severity"], 5),
+            report["timestamp"],
+            len(self.vulnerability_reports) - 1,
+        )
+        bisect.insort(self._sorted_vuln_index, entry)
+
+    def _write_report_file(
+        self, archive: tarfile.TarFile | None, directory: str, filename: str, content: str
+    ) -> None:
+        if archive is None:
+            (self._get_report_dir(directory) / filename).write_text(content, encoding="utf-8")
+            return
+
+        data = content.encode("utf-8")
+        info = tarfile.TarInfo(f"{directory}/{filename}")
+        info.size = len(data)
+        info.mtime = int(time.time())
+        archive.addfile(info, io.BytesIO(data))
+
+    def _report_location(self, archive: tarfile.TarFile | None, directory: str) -> str:
+        if archive is None:
+            return str(self._get_report_dir(directory))
+        return f"{archive.name}:{directory}/"
+
+    def _mark_dirty(self, section: str) -> None:
+        # Called with _reports_lock held
+        self._dirty_sections.add(section)
+        if self._flush_thread is None:
+            self._flush_thread = threading.Thread(
+                target=self._flush_periodically, name="tracer-flush", daemon=True
+            )
+            self._flush_thread.start()
+
+    def _flush_periodically(self) -> None:
+        while not self._stop_flushing.wait(_SAVE_INTERVAL):
+            if self._dirty_sections:
+                self.save_run_data()
+
     def add_vulnerability_report(
         self,
         title: str,
         content: str,
         severity: str,
     ) -> str:
-        report_id = f"vuln-{len(self.vulnerability_reports) + 1:04d}"
-
-        report = {
-            "id": report_id,
-            "title": title.strip(),
-            "content": content.strip(),
-            "severity": severity.lower().strip(),
-            "timestamp": datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S UTC"),
-        }
+        title = title.strip()
+        content = content.strip()
+        severity = _normalize_severity(severity)
+
+        with self._reports_lock:
+            report_id = f"vuln-{len(self.vulnerability_reports) + 1:04d}"
+            report = {
+                "id": report_id,
+                "title": title,
+                "content": content,
+                "severity": severity,
+                "timestamp": _report_timestamp(),
+            }
 
-        self.vulnerability_reports.append(report)
-        logger.info(f"Added vulnerability report: {report_id} - {title}")
+            self._append_vulnerability_report(report)
+            self._mark_dirty("vulnerabilities")
+
+        logger.info("Added vulnerability report: %s - %s", report_id, title)
 
         if self.vulnerability_found_callback:
-            self.vulnerability_found_callback(
-                report_id, title.strip(), content.strip(), severity.lower().strip()
-            )
+            self.vulnerability_found_callback(report_id, title, content, severity)
 
-        self.save_run_data()
         return report_id
 
     def add_pending_vulnerability_report(
@@ -122,29 +260,32 @@ class Tracer:
         Returns:
             Report ID (format: vuln-XXXX)
         """
-        # Use combined count for unique IDs across all report lists
-        total_reports = (
-            len(self.vulnerability_reports)
-            + len(self.pending_vulnerability_reports)
-            + len(self.rejected_vulnerability_reports)
-        )
-        report_id = f"vuln-{total_reports + 1:04d}"
-
-        report = {
-            "id": report_id,
-            "title": title.strip(),
-            "content": content.strip(),
-            "severity": severity.lower().strip(),
-            "evidence": evidence,
-            "status": "pending_verification",
-            "timestamp": datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S UTC"),
-            "verification_attempts": 0,
-        }
+        with self._reports_lock:
+            # Use combined count for unique IDs across all report lists
+            total_reports = (
+                len(self.vulnerability_reports)
+                + len(self.pending_vulnerability_reports)
+                + len(self.rejected_vulnerability_reports)
+                + len(self.needs_manual_review_reports)
+            )
+            report_id = f"vuln-{total_reports + 1:04d}"
+
+            report = {
+                "id": report_id,
+                "title": title.strip(),
+                "content": content.strip(),
+                "severity": _normalize_severity(severity),
+                "evidence": evidence,
+                "status": "pending_verification",
+                "timestamp": _report_timestamp(),
+                "verification_attempts": 0,
+            }
 
-        self.pending_vulnerability_reports.append(report)
-        logger.info(f"Added pending vulnerability report: {report_id} - {title}")
+            self.pending_vulnerability_reports[report_id] = report
+            self._unsaved_pending_reports.append(report)
+            self._mark_dirty("pending")
 
-        self.save_run_data()
+        logger.info("Added pending vulnerability report: %s - %s", report_id, title)
         return report_id
 
     def get_pending_report(self, report_id: str) -> dict[str, Any] | None:
@@ -156,10 +297,7 @@ class Tracer:
         Returns:
             The report dictionary if found, None otherwise
         """
-        for report in self.pending_vulnerability_reports:
-            if report["id"] == report_id:
-                return report
-        return None
+        return self.pending_vulnerability_reports.get(report_id)
 
     def get_pending_reports(self) -> list[dict[str, Any]]:
         """Get all pending verification reports.
@@ -167,7 +305,8 @@ class Tracer:
         Returns:
             Copy of the pending reports list
         """
-        return self.pending_vulnerability_reports.copy()
+        with self._reports_lock:
+            return list(self.pending_vulnerability_reports.values())
 
     def finalize_vulnerability_report(
         self,
@@ -188,31 +327,32 @@ class Tracer:
         Returns:
             True if report was found and finalized, False otherwise
         """
-        for i, report in enumerate(self.pending_vulnerability_reports):
-            if report["id"] == report_id:
-                report["status"] = "verified"
-                report["verified_at"] = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S UTC")
-                report["verification_evidence"] = verification_evidence
-                report["verification_notes"] = notes or []
-
-                # Move to main vulnerability reports
-                self.vulnerability_reports.append(report)
-                self.pending_vulnerability_reports.pop(i)
-
-                logger.info(f"Finalized vulnerability report: {report_id} - {report['title']}")
-
-                # Trigger callback if exists
-                if self.vulnerability_found_callback:
-                    self.vulnerability_found_callback(
-                        report["id"],
-                        report["title"],
-                        report["content"],
-                        report["severity"],
-                    )
+        with self._reports_lock:
+            report = self.pending_vulnerability_reports.pop(report_id, None)
+            if report is None:
+                return False
 
-                self.save_run_data()
-                return True
-        return False
+            report["status"] = "verified"
+            report["verified_at"] = _report_timestamp()
+            report["verification_evidence"] = verification_evidence
+            report["verification_notes"] = notes or []
+
+            # Move to main vulnerability reports
+            self._append_vulnerability_report(report)
+            self._mark_dirty("vulnerabilities")
+
+        logger.info("Finalized vulnerability report: %s - %s", report_id, report["title"])
+
+        # Trigger callback if exists
+        if self.vulnerability_found_callback:
+            self.vulnerability_found_callback(
+                report["id"],
+                report["title"],
+                report["content"],
+                report["severity"],
+            )
+
+        return True
 
     def reject_vulnerability_report(
         self,
@@ -232,24 +372,30 @@ class Tracer:
         Returns:
             True if report was found and rejected, False otherwise
         """
-        for i, report in enumerate(self.pending_vulnerability_reports):
-            if report["id"] == report_id:
-                report["status"] = "rejected"
-                report["rejection_reason"] = reason
-                report["rejection_notes"] = notes or []
-                report["rejected_at"] = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S UTC")
-
-                # Move to rejected reports
-                self.rejected_vulnerability_reports.append(report)
-                self.pending_vulnerability_reports.pop(i)
-
-                logger.info(
-                    f"Rejected vulnerability report: {report_id} - {report['title']} (Reason: {reason})"
-                )
+        with self._reports_lock:
+            report = self.pending_vulnerability_reports.pop(report_id, None)
+            if report is None:
+                return False
+
+            report["status"] = "rejected"
+            report["rejection_reason"] = reason
+            report["rejection_notes"] = notes or []
+            report["rejected_at"] = _report_timestamp()
+
+            # Move to rejected reports
+            self.rejected_vulnerability_reports.append(report)
+            self._unsaved_rejected_reports.append(report)
+            self._resolved_report_ids.add(report_id)
+            self._mark_dirty("rejected")
 
-                self.save_run_data()
-                return True
-        return False
+        logger.info(
+            "Rejected vulnerability report: %s - %s (Reason: %s)",
+            report_id,
+            report["title"],
+            reason,
+        )
+
+        return True
 
     def increment_verification_attempt(self, report_id: str) -> bool:
         """Increment the verification attempt counter for a pending report.
@@ -260,11 +406,13 @@ class Tracer:
         Returns:
             True if report was found and updated, False otherwise
         """
-        for report in self.pending_vulnerability_reports:
-            if report["id"] == report_id:
-                report["verification_attempts"] = report.get("verification_attempts", 0) + 1
-                return True
-        return False
+        with self._reports_lock:
+            report = self.pending_vulnerability_reports.get(report_id)
+            if report is None:
+                return False
+
+            report["verification_attempts"] = report.get("verification_attempts", 0) + 1
+            return True
 
     def is_report_verified(self, report_id: str) -> bool:
         """Check if a report has been verified (finalized, rejected, or moved to manual review).
@@ -278,11 +426,7 @@ class Tracer:
         Returns:
             True if report exists in a finalized state, False otherwise
         """
-        # Check if report exists in any finalized state (not just "not pending")
-        in_verified = any(r["id"] == report_id for r in self.vulnerability_reports)
-        in_rejected = any(r["id"] == report_id for r in self.rejected_vulnerability_reports)
-        in_manual = any(r["id"] == report_id for r in self.needs_manual_review_reports)
-        return in_verified or in_rejected or in_manual
+        return report_id in self._resolved_report_ids
 
     def add_to_manual_review(
         self,
@@ -303,27 +447,28 @@ class Tracer:
         Returns:
             True if report was found and moved, False otherwise
         """
-        report = None
-        for i, r in enumerate(self.pending_vulnerability_reports):
-            if r["id"] == report_id:
-                report = self.pending_vulnerability_reports.pop(i)
-                break
+        with self._reports_lock:
+            report = self.pending_vulnerability_reports.pop(report_id, None)
+            if report is None:
+                return False
 
-        if not report:
-            return False
+            report["status"] = "needs_manual_review"
+            report["review_reason"] = reason
+            report["review_notes"] = notes or []
+            report["moved_at"] = _report_timestamp()
 
-        report["status"] = "needs_manual_review"
-        report["review_reason"] = reason
-        report["review_notes"] = notes or []
-        report["moved_at"] = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S UTC")
-
-        self.needs_manual_review_reports.append(report)
+            self.needs_manual_review_reports.append(report)
+            self._unsaved_manual_review_reports.append(report)
+            self._resolved_report_ids.add(report_id)
+            self._mark_dirty("manual_review")
 
         logger.info(
-            f"Moved report to manual review: {report_id} - {report['title']} (Reason: {reason})"
+            "Moved report to manual review: %s - %s (Reason: %s)",
+            report_id,
+            report["title"],
+            reason,
         )
 
-        self.save_run_data()
         return True
 
     def set_final_scan_result(
@@ -331,28 +476,31 @@ class Tracer:
         content: str,
         success: bool = True,
     ) -> None:
-        self.final_scan_result = content.strip()
+        with self._reports_lock:
+            self.final_scan_result = content.strip()
 
-        self.scan_results = {
-            "scan_completed": True,
-            "content": content,
-            "success": success,
-        }
+            self.scan_results = {
+                "scan_completed": True,
+                "content": content,
+                "success": success,
+            }
+            self._mark_dirty("report")
 
-        logger.info(f"Set final scan result: success={success}")
+        logger.info("Set final scan result: success=%s", success)
         self.save_run_data(mark_complete=True)
 
     def log_agent_creation(
         self, agent_id: str, name: str, task: str, parent_id: str | None = None
     ) -> None:
+        now = datetime.now(UTC).isoformat()
         agent_data: dict[str, Any] = {
             "id": agent_id,
             "name": name,
             "task": task,
             "status": "running",
             "parent_id": parent_id,
-            "created_at": datetime.now(UTC).isoformat(),
-            "updated_at": datetime.now(UTC).isoformat(),
+            "created_at": now,
+            "updated_at": now,
             "tool_executions": [],
         }
 
@@ -368,16 +516,16 @@ class Tracer:
         message_id = self._next_message_id
         self._next_message_id += 1
 
-        message_data = {
-            "message_id": message_id,
-            "content": content,
-            "role": role,
-            "agent_id": agent_id,
-            "timestamp": datetime.now(UTC).isoformat(),
-            "metadata": metadata or {},
-        }
+        message = ChatMessage(
+            message_id=message_id,
+            content=content,
+            role=role,
+            agent_id=agent_id,
+            timestamp=datetime.now(UTC).isoformat(),
+            metadata=metadata or {},
+        )
 
-        self.chat_messages.append(message_data)
+        self.chat_messages.append(message)
         return message_id
 
     def log_tool_execution_start(self, agent_id: str, tool_name: str, args: dict[str, Any]) -> int:
@@ -398,6 +546,9 @@ class Tracer:
         }
 
         self.tool_executions[execution_id] = execution_data
+        self._execution_ids_by_agent.setdefault(agent_id, []).append(execution_id)
+        if tool_name not in _INFO_TOOLS:
+            self._real_tool_count += 1
 
         if agent_id in self.agents:
             self.agents[agent_id]["tool_executions"].append(execution_id)
@@ -407,19 +558,21 @@ class Tracer:
     def update_tool_execution(
         self, execution_id: int, status: str, result: Any | None = None
     ) -> None:
-        if execution_id in self.tool_executions:
-            self.tool_executions[execution_id]["status"] = status
-            self.tool_executions[execution_id]["result"] = result
-            self.tool_executions[execution_id]["completed_at"] = datetime.now(UTC).isoformat()
+        execution = self.tool_executions.get(execution_id)
+        if execution is not None:
+            execution["status"] = status
+            execution["result"] = result
+            execution["completed_at"] = datetime.now(UTC).isoformat()
 
     def update_agent_status(
         self, agent_id: str, status: str, error_message: str | None = None
     ) -> None:
-        if agent_id in self.agents:
-            self.agents[agent_id]["status"] = status
-            self.agents[agent_id]["updated_at"] = datetime.now(UTC).isoformat()
+        agent = self.agents.get(agent_id)
+        if agent is not None:
+            agent["status"] = status
+            agent["updated_at"] = datetime.now(UTC).isoformat()
             if error_message:
-                self.agents[agent_id]["error_message"] = error_message
+                agent["error_message"] = error_message
 
     def set_scan_config(self, config: dict[str, Any]) -> None:
         self.scan_config = config
@@ -432,151 +585,161 @@ class Tracer:
         )
         self.get_run_dir()
 
-    def save_run_data(self, mark_complete: bool = False) -> None:  # noqa: PLR0912, PLR0915
-        try:
-            run_dir = self.get_run_dir()
+    def save_run_data(self, mark_complete: bool = False) -> None:
+        """Write the sections that changed since the last save.
+
+        Mutations only mark their section dirty; a background thread calls this
+        every few seconds, and it is called directly when the scan completes.
+        Report state is copied under the reports lock and written outside it.
+        """
+        with self._save_lock:
+            with self._reports_lock:
+                dirty, self._dirty_sections = self._dirty_sections, set()
+                snapshot = self._snapshot_reports(dirty) if dirty else None
+
             if mark_complete:
                 self.end_time = datetime.now(UTC).isoformat()
+            if snapshot is None:
+                return
+
+            try:
+                self._write_sections(snapshot)
+            except (OSError, RuntimeError):
+                logger.exception("Failed to save scan data")
+                with self._reports_lock:
+                    self._dirty_sections |= dirty
+
+    def _snapshot_reports(self, dirty: set[str]) -> _ReportSnapshot:
+        # Called with _reports_lock held
+        sorted_vulnerabilities = None
+        if "vulnerabilities" in dirty and len(self._sorted_vuln_index) != self._csv_report_count:
+            reports = self.vulnerability_reports
+            sorted_vulnerabilities = [reports[pos] for _, _, pos in self._sorted_vuln_index]
+
+        return _ReportSnapshot(
+            dirty=dirty,
+            final_scan_result=self.final_scan_result,
+            new_vulnerabilities=list(self._unsaved_vuln_reports),
+            sorted_vulnerabilities=sorted_vulnerabilities,
+            # Pending reports are still updated in place, so they are copied. Reports
+            # resolved before the flush are saved under their new state instead.
+            pending=[
+                dict(report)
+                for report in self._unsaved_pending_reports
+                if report["id"] in self.pending_vulnerability_reports
+            ],
+            pending_queued=len(self._unsaved_pending_reports),
+            rejected=list(self._unsaved_rejected_reports),
+            manual_review=list(self._unsaved_manual_review_reports),
+        )
 
-            if self.final_scan_result:
-                penetration_test_report_file = run_dir / "penetration_test_report.md"
-                with penetration_test_report_file.open("w", encoding="utf-8") as f:
-                    f.write("# Security Penetration Test Report\n\n")
-                    f.write(
-                        f"**Generated:** {datetime.now(UTC).strftime('%Y-%m-%d %H:%M:%S UTC')}\n\n"
-                    )
-                    f.write(f"{self.final_scan_result}\n")
-                logger.info(
-                    f"Saved final penetration test report to: {penetration_test_report_file}"
-                )
+    def _mark_saved(self, queue: deque[dict[str, Any]], count: int) -> None:
+        # Queues are only appended to, so the first count entries are the ones written
+        with self._reports_lock:
+            for _ in range(count):
+                queue.popleft()
+
+    def _write_sections(self, snapshot: _ReportSnapshot) -> None:
+        run_dir = self.get_run_dir()
+
+        if "report" in snapshot.dirty and snapshot.final_scan_result:
+            penetration_test_report_file = run_dir / "penetration_test_report.md"
+            penetration_test_report_file.write_text(
+                "# Security Penetration Test Report\n\n"
+                f"**Generated:** {_report_timestamp()}\n\n"
+                f"{snapshot.final_scan_result}\n",
+                encoding="utf-8",
+            )
+            logger.info("Saved final penetration test report to: %s", penetration_test_report_file)
 
-            if self.vulnerability_reports:
-                vuln_dir = run_dir / "vulnerabilities"
-                vuln_dir.mkdir(exist_ok=True)
-
-                new_reports = [
-                    report
-                    for report in self.vulnerability_reports
-                    if report["id"] not in self._saved_vuln_ids
-                ]
-
-                for report in new_reports:
-                    vuln_file = vuln_dir / f"{report['id']}.md"
-                    with vuln_file.open("w", encoding="utf-8") as f:
-                        f.write(f"# {report['title']}\n\n")
-                        f.write(f"**ID:** {report['id']}\n")
-                        f.write(f"**Severity:** {report['severity'].upper()}\n")
-                        f.write(f"**Found:** {report['timestamp']}\n\n")
-                        f.write("## Description\n\n")
-                        f.write(f"{report['content']}\n")
-                    self._saved_vuln_ids.add(report["id"])
-
-                if self.vulnerability_reports:
-                    severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3, "info": 4}
-                    sorted_reports = sorted(
-                        self.vulnerability_reports,
-                        key=lambda x: (severity_order.get(x["severity"], 5), x["timestamp"]),
-                    )
+        with contextlib.ExitStack() as stack:
+            archive = None
+            # Per-report files go into one tar archive when STRIX_ARCHIVE_REPORTS is set
+            if self._archive_reports and "vulnerabilities" in snapshot.dirty:
+                archive = stack.enter_context(tarfile.open(run_dir / _REPORT_ARCHIVE_NAME, "a"))
+            self._write_report_sections(snapshot, run_dir, archive)
+
+        logger.info("📊 Essential scan data saved to: %s", run_dir)
 
-                    vuln_csv_file = run_dir / "vulnerabilities.csv"
-                    with vuln_csv_file.open("w", encoding="utf-8", newline="") as f:
-                        import csv
-
-                        fieldnames = ["id", "title", "severity", "timestamp", "file"]
-                        writer = csv.DictWriter(f, fieldnames=fieldnames)
-                        writer.writeheader()
-
-                        for report in sorted_reports:
-                            writer.writerow(
-                                {
-                                    "id": report["id"],
-                                    "title": report["title"],
-                                    "severity": report["severity"].upper(),
-                                    "timestamp": report["timestamp"],
-                                    "file": f"vulnerabilities/{report['id']}.md",
-                                }
-                            )
-
-                if new_reports:
-                    logger.info(
-                        f"Saved {len(new_reports)} new vulnerability report(s) to: {vuln_dir}"
+    def _write_report_sections(
+        self, snapshot: _ReportSnapshot, run_dir: Path, archive: tarfile.TarFile | None
+    ) -> None:
+        dirty = snapshot.dirty
+        if "vulnerabilities" in dirty:
+            saved_count = 0
+            try:
+                for report in snapshot.new_vulnerabilities:
+                    self._write_report_file(
+                        archive,
+                        "vulnerabilities",
+                        f"{report['id']}.md",
+                        f"# {report['title']}\n\n"
+                        f"**ID:** {report['id']}\n"
+                        f"**Severity:** {report['severity'].upper()}\n"
+                        f"**Found:** {report['timestamp']}\n\n"
+                        "## Description\n\n"
+                        f"{report['content']}\n",
                     )
-                logger.info(f"Updated vulnerability index: {vuln_csv_file}")
-
-            # Save pending verification reports
-            if self.pending_vulnerability_reports:
-                pending_dir = run_dir / "pending_verifications"
-                pending_dir.mkdir(exist_ok=True)
-
-                import json
-
-                new_pending = [
-                    report
-                    for report in self.pending_vulnerability_reports
-                    if report["id"] not in self._saved_pending_ids
-                ]
-
-                for report in new_pending:
-                    pending_file = pending_dir / f"{report['id']}.json"
-                    with pending_file.open("w", encoding="utf-8") as f:
-                        json.dump(report, f, indent=2)
-                    self._saved_pending_ids.add(report["id"])
-
-                if new_pending:
-                    logger.info(
-                        f"Saved {len(new_pending)} pending verification report(s) to: {pending_dir}"
+                    saved_count += 1
+            finally:
+                self._mark_saved(self._unsaved_vuln_reports, saved_count)
+
+            if snapshot.sorted_vulnerabilities is not None:
+                buffer = io.StringIO(newline="")
+                writer = csv.writer(buffer)
+                writer.writerow(("id", "title", "severity", "timestamp", "file"))
+                writer.writerows(
+                    (
+                        report["id"],
+                        report["title"],
+                        report["severity"].upper(),
+                        report["timestamp"],
+                        f"vulnerabilities/{report['id']}.md",
                     )
+                    for report in snapshot.sorted_vulnerabilities
+                )
 
-            # Save rejected reports (false positives)
-            if self.rejected_vulnerability_reports:
-                rejected_dir = run_dir / "rejected_false_positives"
-                rejected_dir.mkdir(exist_ok=True)
-
-                import json
-
-                new_rejected = [
-                    report
-                    for report in self.rejected_vulnerability_reports
-                    if report["id"] not in self._saved_rejected_ids
-                ]
-
-                for report in new_rejected:
-                    rejected_file = rejected_dir / f"{report['id']}.json"
-                    with rejected_file.open("w", encoding="utf-8") as f:
-                        json.dump(report, f, indent=2)
-                    self._saved_rejected_ids.add(report["id"])
-
-                if new_rejected:
-                    logger.info(f"Saved {len(new_rejected)} rejected report(s) to: {rejected_dir}")
-
-            # Save manual review reports (auto-rejected due to verification agent failure)
-            if self.needs_manual_review_reports:
-                manual_review_dir = run_dir / "needs_manual_review"
-                manual_review_dir.mkdir(exist_ok=True)
-
-                import json
-
-                new_manual_review = [
-                    report
-                    for report in self.needs_manual_review_reports
-                    if report["id"] not in self._saved_manual_review_ids
-                ]
-
-                for report in new_manual_review:
-                    review_file = manual_review_dir / f"{report['id']}.json"
-                    with review_file.open("w", encoding="utf-8") as f:
-                        json.dump(report, f, indent=2)
-                    self._saved_manual_review_ids.add(report["id"])
-
-                if new_manual_review:
-                    logger.info(
-                        f"Saved {len(new_manual_review)} report(s) requiring manual review to: {manual_review_dir}"
-                    )
+                vuln_csv_file = run_dir / "vulnerabilities.csv"
+                vuln_csv_file.write_text(buffer.getvalue(), encoding="utf-8", newline="")
+                self._csv_report_count = len(snapshot.sorted_vulnerabilities)
+                logger.info("Updated vulnerability index: %s", vuln_csv_file)
 
-            logger.info(f"📊 Essential scan data saved to: {run_dir}")
+            # The save summaries run on every flush, so skip building them when INFO is off
+            if saved_count and logger.isEnabledFor(logging.INFO):
+                location = self._report_location(archive, "vulnerabilities")
+                logger.info("Saved %d new vulnerability report(s) to: %s", saved_count, location)
 
-        except (OSError, RuntimeError):
-            logger.exception("Failed to save scan data")
+        # Pending, rejected and manual-review reports are appended to JSONL logs
+        if "pending" in dirty and snapshot.pending_queued:
+            self._append_report_log(
+                snapshot.pending, "pending_verifications.jsonl", "pending verification report(s)"
+            )
+            self._mark_saved(self._unsaved_pending_reports, snapshot.pending_queued)
+
+        if "rejected" in dirty and snapshot.rejected:
+            self._append_report_log(
+                snapshot.rejected, "rejected_false_positives.jsonl", "rejected report(s)"
+            )
+            self._mark_saved(self._unsaved_rejected_reports, len(snapshot.rejected))
+
+        if "manual_review" in dirty and snapshot.manual_review:
+            self._append_report_log(
+                snapshot.manual_review,
+                "needs_manual_review.jsonl",
+                "report(s) requiring manual review",
+            )
+            self._mark_saved(self._unsaved_manual_review_reports, len(snapshot.manual_review))
+
+    def _append_report_log(
+        self, reports: list[dict[str, Any]], filename: str, description: str
+    ) -> None:
+        if not reports:
+            return
+
+        log_file = self.get_run_dir() / filename
+        with log_file.open("a", encoding="utf-8") as f:
+            f.write("".join(f"{json.dumps(report)}\n" for report in reports))
+        logger.info("Saved %d %s to: %s", len(reports), description, log_file)
 
     def _calculate_duration(self) -> float:
         try:
@@ -589,22 +752,13 @@ class Tracer:
         return 0.0
 
     def get_agent_tools(self, agent_id: str) -> list[dict[str, Any]]:
-        return [
-            exec_data
-            for exec_data in list(self.tool_executions.values())
-            if exec_data.get("agent_id") == agent_id
-        ]
+        execution_ids = self._execution_ids_by_agent.get(agent_id, [])
+        return [self.tool_executions[execution_id] for execution_id in execution_ids]
 
     def get_real_tool_count(self) -> int:
-        return sum(
-            1
-            for exec_data in list(self.tool_executions.values())
-            if exec_data.get("tool_name") not in ["scan_start_info", "subagent_start_info"]
-        )
+        return self._real_tool_count
 
     def get_total_llm_stats(self) -> dict[str, Any]:
-        from strix.tools.agents_graph.agents_graph_actions import _agent_instances
-
         total_stats = {
             "input_tokens": 0,
             "output_tokens": 0,
@@ -615,7 +769,7 @@ class Tracer:
             "failed_requests": 0,
         }
 
-        for agent_instance in _agent_instances.values():
+        for agent_instance in _agent_instances().values():
             if hasattr(agent_instance, "llm") and hasattr(agent_instance.llm, "_total_stats"):
                 agent_stats = agent_instance.llm._total_stats
                 total_stats["input_tokens"] += agent_stats.input_tokens
@@ -647,4 +801,5 @@ class Tracer:
         except ImportError:
             pass
 
+        self._stop_flushing.set()
         self.save_run_data(mark_complete=True)
@@ -1,14 +1,7 @@
+import importlib
 import os
+from typing import TYPE_CHECKING, Any
 
-from .executor import (
-    execute_tool,
-    execute_tool_invocation,
-    execute_tool_with_validation,
-    extract_screenshot_from_result,
-    process_tool_invocations,
-    remove_screenshot_from_result,
-    validate_tool_availability,
-)
 from .registry import (
     ImplementedInClientSideOnlyError,
     get_tool_by_name,
@@ -21,6 +14,40 @@ from .registry import (
 )
 
 
+if TYPE_CHECKING:
+    from .executor import (
+        execute_tool,
+        execute_tool_invocation,
+        execute_tool_with_validation,
+        extract_screenshot_from_result,
+        process_tool_invocations,
+        remove_screenshot_from_result,
+        validate_tool_availability,
+    )
+
+# The executor pulls in httpx and the runtime; load it on first use so that
+# importing a single tool module or the registry stays cheap.
+_EXECUTOR_EXPORTS = frozenset(
+    {
+        "execute_tool",
+        "execute_tool_invocation",
+        "execute_tool_with_validation",
+        "extract_screenshot_from_result",
+        "process_tool_invocations",
+        "remove_screenshot_from_result",
+        "validate_tool_availability",
+    }
+)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXECUTOR_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(".executor", __name__), name)
+    globals()[name] = value
+    return value
+
+
 SANDBOX_MODE = os.getenv("STRIX_SANDBOX_MODE", "false").lower() == "true"
 
 HAS_PERPLEXITY_API = bool(os.getenv("PERPLEXITY_API_KEY"))
@@ -1,7 +1,13 @@
+import asyncio
+import os
 import threading
+from collections import Counter, deque
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any, Literal
+from uuid import uuid4
 
+from strix.telemetry.tracer import get_global_tracer
 from strix.tools.registry import register_tool
 
 
@@ -12,7 +18,21 @@ _agent_graph: dict[str, Any] = {
 
 _root_agent_id: str | None = None
 
-_agent_messages: dict[str, list[dict[str, Any]]] = {}
+
+@dataclass(slots=True)
+class AgentMessage:
+    id: str
+    from_: str
+    to: str
+    content: str
+    message_type: str
+    priority: str
+    timestamp: str
+    delivered: bool = False
+    read: bool = False
+
+
+_agent_messages: dict[str, deque[AgentMessage]] = {}
 
 _running_agents: dict[str, threading.Thread] = {}
 
@@ -23,6 +43,35 @@ _agent_states: dict[str, Any] = {}
 # Thread-safe lock for all agent graph operations
 _agent_graph_lock = threading.RLock()
 
+# Optional cap on concurrently running sub-agents; 0 means no limit
+_MAX_RUNNING_AGENTS = int(os.getenv("STRIX_MAX_AGENTS", "0"))
+# Sub-agents that hold a slot under that cap but are not in _running_agents yet
+_starting_agents = 0
+
+# Delegation children per agent; edges are append-only, so only new ones are indexed
+_delegation_children: dict[str, list[str]] = {}
+_indexed_edge_count = 0
+
+
+def _get_delegation_children() -> dict[str, list[str]]:
+    """Return the delegation children of each agent, indexing edges added since the last call.
+
+    Must be called while holding _agent_graph_lock.
+    """
+    global _indexed_edge_count  # noqa: PLW0603
+
+    edges = _agent_graph["edges"]
+    if len(edges) < _indexed_edge_count:
+        _delegation_children.clear()
+        _indexed_edge_count = 0
+
+    for edge in edges[_indexed_edge_count:]:
+        if edge.get("type") == "delegation":
+            _delegation_children.setdefault(edge["from"], []).append(edge["to"])
+    _indexed_edge_count = len(edges)
+
+    return _delegation_children
+
 
 def _run_agent_in_thread(
     agent: Any, state: Any, inherited_messages: list[dict[str, Any]]
@@ -77,8 +126,6 @@ def _run_agent_in_thread(
             _agent_states[state.agent_id] = state
             _agent_graph["nodes"][state.agent_id]["state"] = state.model_dump()
 
-        import asyncio
-
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         try:
@@ -88,109 +135,169 @@ def _run_agent_in_thread(
 
     except Exception as e:
         with _agent_graph_lock:
-            _agent_graph["nodes"][state.agent_id]["status"] = "error"
-            _agent_graph["nodes"][state.agent_id]["finished_at"] = datetime.now(UTC).isoformat()
-            _agent_graph["nodes"][state.agent_id]["result"] = {"error": str(e)}
+            node = _agent_graph["nodes"][state.agent_id]
+            node["status"] = "error"
+            node["finished_at"] = datetime.now(UTC).isoformat()
+            node["result"] = {"error": str(e)}
             _running_agents.pop(state.agent_id, None)
             _agent_instances.pop(state.agent_id, None)
         raise
     else:
         with _agent_graph_lock:
-            if state.stop_requested:
-                _agent_graph["nodes"][state.agent_id]["status"] = "stopped"
-            else:
-                _agent_graph["nodes"][state.agent_id]["status"] = "completed"
-            _agent_graph["nodes"][state.agent_id]["finished_at"] = datetime.now(UTC).isoformat()
-            _agent_graph["nodes"][state.agent_id]["result"] = result
+            node = _agent_graph["nodes"][state.agent_id]
+            node["status"] = "stopped" if state.stop_requested else "completed"
+            node["finished_at"] = datetime.now(UTC).isoformat()
+            node["result"] = result
             _running_agents.pop(state.agent_id, None)
             _agent_instances.pop(state.agent_id, None)
 
         return {"result": result}
 
 
-@register_tool(sandbox_execution=False, parallelizable=True)
-def view_agent_graph(agent_state: Any) -> dict[str, Any]:
-    try:
-        with _agent_graph_lock:
-            structure_lines = ["=== AGENT GRAPH STRUCTURE ==="]
+def _render_graph_structure(current_agent_id: str) -> str:
+    """Render the delegation tree as indented text.
 
-            def _build_tree(agent_id: str, depth: int = 0) -> None:
-                node = _agent_graph["nodes"][agent_id]
-                indent = "  " * depth
+    Must be called while holding _agent_graph_lock.
+    """
+    structure_lines = ["=== AGENT GRAPH STRUCTURE ==="]
+    delegation_children = _get_delegation_children()
 
-                you_indicator = " ← This is you" if agent_id == agent_state.agent_id else ""
+    def _build_tree(agent_id: str, depth: int = 0) -> None:
+        node = _agent_graph["nodes"][agent_id]
+        indent = "  " * depth
 
-                structure_lines.append(f"{indent}* {node['name']} ({agent_id}){you_indicator}")
-                structure_lines.append(f"{indent}  Task: {node['task']}")
-                structure_lines.append(f"{indent}  Status: {node['status']}")
+        you_indicator = " ← This is you" if agent_id == current_agent_id else ""
 
-                children = [
-                    edge["to"]
-                    for edge in _agent_graph["edges"]
-                    if edge["from"] == agent_id and edge["type"] == "delegation"
-                ]
+        structure_lines.append(f"{indent}* {node['name']} ({agent_id}){you_indicator}")
+        structure_lines.append(f"{indent}  Task: {node['task']}")
+        structure_lines.append(f"{indent}  Status: {node['status']}")
 
-                if children:
-                    structure_lines.append(f"{indent}   Children:")
-                    for child_id in children:
-                        _build_tree(child_id, depth + 2)
+        children = delegation_children.get(agent_id, ())
 
-            root_agent_id = _root_agent_id
-            if not root_agent_id and _agent_graph["nodes"]:
-                for agent_id, node in _agent_graph["nodes"].items():
-                    if node.get("parent_id") is None:
-                        root_agent_id = agent_id
-                        break
-                if not root_agent_id:
-                    root_agent_id = next(iter(_agent_graph["nodes"].keys()))
+        if children:
+            structure_lines.append(f"{indent}   Children:")
+            for child_id in children:
+                _build_tree(child_id, depth + 2)
 
-            if root_agent_id and root_agent_id in _agent_graph["nodes"]:
-                _build_tree(root_agent_id)
-            else:
-                structure_lines.append("No agents in the graph yet")
+    # _root_agent_id is set when the first parentless agent registers itself
+    # (BaseAgent._add_to_agents_graph); fall back to the oldest node until then
+    root_agent_id = _root_agent_id or next(iter(_agent_graph["nodes"]), None)
 
-            graph_structure = "\n".join(structure_lines)
+    if root_agent_id and root_agent_id in _agent_graph["nodes"]:
+        _build_tree(root_agent_id)
+    else:
+        structure_lines.append("No agents in the graph yet")
 
-            total_nodes = len(_agent_graph["nodes"])
-            running_count = sum(
-                1 for node in _agent_graph["nodes"].values() if node["status"] == "running"
-            )
-            waiting_count = sum(
-                1 for node in _agent_graph["nodes"].values() if node["status"] == "waiting"
-            )
-            stopping_count = sum(
-                1 for node in _agent_graph["nodes"].values() if node["status"] == "stopping"
-            )
-            completed_count = sum(
-                1 for node in _agent_graph["nodes"].values() if node["status"] == "completed"
-            )
-            stopped_count = sum(
-                1 for node in _agent_graph["nodes"].values() if node["status"] == "stopped"
-            )
-            failed_count = sum(
-                1
-                for node in _agent_graph["nodes"].values()
-                if node["status"] in ["failed", "error"]
+    return "\n".join(structure_lines)
+
+
+@register_tool(sandbox_execution=False, parallelizable=True)
+def view_agent_graph(agent_state: Any, include_structure: bool = True) -> dict[str, Any]:
+    try:
+        with _agent_graph_lock:
+            graph_structure = (
+                _render_graph_structure(agent_state.agent_id) if include_structure else None
             )
 
+            total_nodes = len(_agent_graph["nodes"])
+            status_counts = Counter(node["status"] for node in _agent_graph["nodes"].values())
+
     except Exception as e:  # noqa: BLE001
         return {
             "error": f"Failed to view agent graph: {e}",
             "graph_structure": "Error retrieving graph structure",
         }
     else:
-        return {
-            "graph_structure": graph_structure,
-            "summary": {
-                "total_agents": total_nodes,
-                "running": running_count,
-                "waiting": waiting_count,
-                "stopping": stopping_count,
-                "completed": completed_count,
-                "stopped": stopped_count,
-                "failed": failed_count,
-            },
+        result: dict[str, Any] = {}
+        if graph_structure is not None:
+            result["graph_structure"] = graph_structure
+        result["summary"] = {
+            "total_agents": total_nodes,
+            "running": status_counts["running"],
+            "waiting": status_counts["waiting"],
+            "stopping": status_counts["stopping"],
+            "completed": status_counts["completed"],
+            "stopped": status_counts["stopped"],
+            "failed": status_counts["failed"] + status_counts["error"],
         }
+        return result
+
+
+def _reserve_agent_slot() -> int | None:
+    """Reserve a slot under STRIX_MAX_AGENTS, or return the running count if none is free.
+
+    The check and the reservation happen under one lock, so concurrent calls cannot
+    all pass the check. A reserved slot is released with _release_agent_slot.
+    """
+    global _starting_agents  # noqa: PLW0603
+
+    with _agent_graph_lock:
+        running_count = len(_running_agents) + _starting_agents
+        if _MAX_RUNNING_AGENTS and running_count >= _MAX_RUNNING_AGENTS:
+            return running_count
+        _starting_agents += 1
+        return None
+
+
+def _release_agent_slot() -> None:
+    global _starting_agents  # noqa: PLW0603
+
+    with _agent_graph_lock:
+        _starting_agents -= 1
+
+
+def _create_sub_agent(
+    parent_id: str, task: str, name: str, module_list: list[str]
+) -> tuple[Any, Any]:
+    from strix.agents import StrixAgent
+    from strix.agents.state import AgentState
+    from strix.llm.config import LLMConfig
+
+    state = AgentState(task=task, agent_name=name, parent_id=parent_id, max_iterations=300)
+
+    with _agent_graph_lock:
+        parent_agent = _agent_instances.get(parent_id)
+
+    timeout = None
+    scan_mode = "deep"
+    if parent_agent and hasattr(parent_agent, "llm_config"):
+        if hasattr(parent_agent.llm_config, "timeout"):
+            timeout = parent_agent.llm_config.timeout
+        if hasattr(parent_agent.llm_config, "scan_mode"):
+            scan_mode = parent_agent.llm_config.scan_mode
+
+    llm_config = LLMConfig(prompt_modules=module_list, timeout=timeout, scan_mode=scan_mode)
+
+    agent_config = {
+        "llm_config": llm_config,
+        "state": state,
+    }
+    if parent_agent and hasattr(parent_agent, "non_interactive"):
+        agent_config["non_interactive"] = parent_agent.non_interactive
+
+    return StrixAgent(agent_config), state
+
+
+def _start_agent_thread(agent: Any, state: Any, inherited_messages: list[dict[str, Any]]) -> None:
+    thread = threading.Thread(
+        target=_run_agent_in_thread,
+        args=(agent, state, inherited_messages),
+        daemon=True,
+        name=f"Agent-{state.agent_name}-{state.agent_id}",
+    )
+
+    # Registered before starting, so an agent that finishes at once is not re-added
+    with _agent_graph_lock:
+        _agent_instances[state.agent_id] = agent
+        _running_agents[state.agent_id] = thread
+
+    try:
+        thread.start()
+    except RuntimeError:
+        with _agent_graph_lock:
+            _agent_instances.pop(state.agent_id, None)
+            _running_agents.pop(state.agent_id, None)
+        raise
 
 
 @register_tool(sandbox_execution=False)
@@ -231,49 +338,28 @@ def create_agent(
                     "agent_id": None,
                 }
 
-        from strix.agents import StrixAgent
-        from strix.agents.state import AgentState
-        from strix.llm.config import LLMConfig
-
-        state = AgentState(task=task, agent_name=name, parent_id=parent_id, max_iterations=300)
-
-        with _agent_graph_lock:
-            parent_agent = _agent_instances.get(parent_id)
-
-        timeout = None
-        scan_mode = "deep"
-        if parent_agent and hasattr(parent_agent, "llm_config"):
-            if hasattr(parent_agent.llm_config, "timeout"):
-                timeout = parent_agent.llm_config.timeout
-            if hasattr(parent_agent.llm_config, "scan_mode"):
-                scan_mode = parent_agent.llm_config.scan_mode
-
-        llm_config = LLMConfig(prompt_modules=module_list, timeout=timeout, scan_mode=scan_mode)
-
-        agent_config = {
-            "llm_config": llm_config,
-            "state": state,
-        }
-        if parent_agent and hasattr(parent_agent, "non_interactive"):
-            agent_config["non_interactive"] = parent_agent.non_interactive
-
-        agent = StrixAgent(agent_config)
+        running_count = _reserve_agent_slot()
+        if running_count is not None:
+            return {
+                "success": False,
+                "error": (
+                    f"Cannot create agent: {running_count} agents are already running "
+                    f"(limit {_MAX_RUNNING_AGENTS}). Use wait_for_message until some finish, "
+                    "then try again."
+                ),
+                "agent_id": None,
+            }
 
-        inherited_messages = []
-        if inherit_context:
-            inherited_messages = agent_state.get_conversation_history()
+        try:
+            agent, state = _create_sub_agent(parent_id, task, name, module_list)
 
-        thread = threading.Thread(
-            target=_run_agent_in_thread,
-            args=(agent, state, inherited_messages),
-            daemon=True,
-            name=f"Agent-{name}-{state.agent_id}",
-        )
-        thread.start()
+            inherited_messages = []
+            if inherit_context:
+                inherited_messages = agent_state.get_conversation_history()
 
-        with _agent_graph_lock:
-            _agent_instances[state.agent_id] = agent
-            _running_agents[state.agent_id] = thread
+            _start_agent_thread(agent, state, inherited_messages)
+        finally:
+            _release_agent_slot()
 
     except Exception as e:  # noqa: BLE001
         return {"success": False, "error": f"Failed to create agent: {e}", "agent_id": None}
@@ -301,7 +387,8 @@ def send_message_to_agent(
 ) -> dict[str, Any]:
     try:
         with _agent_graph_lock:
-            if target_agent_id not in _agent_graph["nodes"]:
+            target_node = _agent_graph["nodes"].get(target_agent_id)
+            if target_node is None:
                 return {
                     "success": False,
                     "error": f"Target agent '{target_agent_id}' not found in graph",
@@ -309,7 +396,6 @@ def send_message_to_agent(
                 }
 
             # Check if target agent can receive messages (Phase 4 fix)
-            target_node = _agent_graph["nodes"][target_agent_id]
             target_status = target_node.get("status", "")
             if target_status in ("stopped", "failed", "error", "finished"):
                 return {
@@ -321,25 +407,18 @@ def send_message_to_agent(
 
             sender_id = agent_state.agent_id
 
-            from uuid import uuid4
-
             message_id = f"msg_{uuid4().hex[:8]}"
-            message_data = {
-                "id": message_id,
-                "from": sender_id,
-                "to": target_agent_id,
-                "content": message,
-                "message_type": message_type,
-                "priority": priority,
-                "timestamp": datetime.now(UTC).isoformat(),
-                "delivered": False,
-                "read": False,
-            }
-
-            if target_agent_id not in _agent_messages:
-                _agent_messages[target_agent_id] = []
+            message_data = AgentMessage(
+                id=message_id,
+                from_=sender_id,
+                to=target_agent_id,
+                content=message,
+                message_type=message_type,
+                priority=priority,
+                timestamp=datetime.now(UTC).isoformat(),
+            )
 
-            _agent_messages[target_agent_id].append(message_data)
+            _agent_messages.setdefault(target_agent_id, deque()).append(message_data)
 
             _agent_graph["edges"].append(
                 {
@@ -349,13 +428,13 @@ def send_message_to_agent(
                     "message_id": message_id,
                     "message_type": message_type,
                     "priority": priority,
-                    "created_at": datetime.now(UTC).isoformat(),
+                    "created_at": message_data.timestamp,
                 }
             )
 
-            message_data["delivered"] = True
+            message_data.delivered = True
 
-            target_name = _agent_graph["nodes"][target_agent_id]["name"]
+            target_name = target_node["name"]
             sender_name = _agent_graph["nodes"][sender_id]["name"]
 
             return {
@@ -366,7 +445,7 @@ def send_message_to_agent(
                 "target_agent": {
                     "id": target_agent_id,
                     "name": target_name,
-                    "status": _agent_graph["nodes"][target_agent_id]["status"],
+                    "status": target_node["status"],
                 },
             }
 
@@ -396,40 +475,34 @@ def agent_finish(
         agent_id = agent_state.agent_id
 
         with _agent_graph_lock:
-            if agent_id not in _agent_graph["nodes"]:
+            agent_node = _agent_graph["nodes"].get(agent_id)
+            if agent_node is None:
                 return {"agent_completed": False, "error": "Current agent not found in graph"}
 
-            agent_node = _agent_graph["nodes"][agent_id]
-
             # Check if this is a verification agent that hasn't verified yet
             if agent_node.get("type") == "verification":
                 report_id = agent_node.get("report_id")
                 if report_id:
-                    try:
-                        from strix.telemetry.tracer import get_global_tracer
-
-                        tracer = get_global_tracer()
-                        if tracer and not tracer.is_report_verified(report_id):
-                            return {
-                                "agent_completed": False,
-                                "error": (
-                                    "Cannot finish verification agent without recording "
-                                    "a verification decision. You MUST call "
-                                    f"verify_vulnerability_report(report_id='{report_id}', "
-                                    "verified=True/False) before calling agent_finish. "
-                                    "If you could not reproduce the vulnerability, call "
-                                    "verify_vulnerability_report with verified=False and "
-                                    "provide a rejection_reason."
-                                ),
-                                "parent_notified": False,
-                                "required_action": {
-                                    "tool": "verify_vulnerability_report",
-                                    "report_id": report_id,
-                                    "hint": "verified=True if reproduced, False if not",
-                                },
-                            }
-                    except ImportError:
-                        pass  # Tracer not available, allow finish
+                    tracer = get_global_tracer()
+                    if tracer and not tracer.is_report_verified(report_id):
+                        return {
+                            "agent_completed": False,
+                            "error": (
+                                "Cannot finish verification agent without recording "
+                                "a verification decision. You MUST call "
+                                f"verify_vulnerability_report(report_id='{report_id}', "
+                                "verified=True/False) before calling agent_finish. "
+                                "If you could not reproduce the vulnerability, call "
+                                "verify_vulnerability_report with verified=False and "
+                                "provide a rejection_reason."
+                            ),
+                            "parent_notified": False,
+                            "required_action": {
+                                "tool": "verify_vulnerability_report",
+                                "report_id": report_id,
+                                "hint": "verified=True if reproduced, False if not",
+                            },
+                        }
 
             agent_node["status"] = "finished" if success else "failed"
             agent_node["finished_at"] = datetime.now(UTC).isoformat()
@@ -447,11 +520,13 @@ def agent_finish(
 
                 if parent_id in _agent_graph["nodes"]:
                     findings_xml = "\n".join(
-                        f"        <finding>{finding}</finding>" for finding in (findings or [])
+                        [f"        <finding>{finding}</finding>" for finding in findings or ()]
                     )
                     recommendations_xml = "\n".join(
-                        f"        <recommendation>{rec}</recommendation>"
-                        for rec in (final_recommendations or [])
+                        [
+                            f"        <recommendation>{rec}</recommendation>"
+                            for rec in final_recommendations or ()
+                        ]
                     )
 
                     report_message = f"""<agent_completion_report>
@@ -473,23 +548,17 @@ def agent_finish(
     </results>
 </agent_completion_report>"""
 
-                    if parent_id not in _agent_messages:
-                        _agent_messages[parent_id] = []
-
-                    from uuid import uuid4
-
-                    _agent_messages[parent_id].append(
-                        {
-                            "id": f"report_{uuid4().hex[:8]}",
-                            "from": agent_id,
-                            "to": parent_id,
-                            "content": report_message,
-                            "message_type": "information",
-                            "priority": "high",
-                            "timestamp": datetime.now(UTC).isoformat(),
-                            "delivered": True,
-                            "read": False,
-                        }
+                    _agent_messages.setdefault(parent_id, deque()).append(
+                        AgentMessage(
+                            id=f"report_{uuid4().hex[:8]}",
+                            from_=agent_id,
+                            to=parent_id,
+                            content=report_message,
+                            message_type="information",
+                            priority="high",
+                            timestamp=agent_node["finished_at"],
+                            delivered=True,
+                        )
                     )
 
                     parent_notified = True
@@ -524,13 +593,8 @@ def _stop_child_agents(parent_id: str) -> list[str]:
     Must be called while holding _agent_graph_lock.
     """
     stopped_children = []
-    child_edges = [
-        e
-        for e in _agent_graph["edges"]
-        if e.get("from") == parent_id and e.get("type") == "delegation"
-    ]
-    for edge in child_edges:
-        child_id = edge["to"]
+    # Copy the list so the loop is unaffected by children registered while stopping
+    for child_id in list(_get_delegation_children().get(parent_id, ())):
         child_node = _agent_graph["nodes"].get(child_id)
         if child_node and child_node.get("status") in ("running", "waiting"):
             stop_agent(child_id, propagate_to_children=True)
@@ -541,15 +605,14 @@ def _stop_child_agents(parent_id: str) -> list[str]:
 def stop_agent(agent_id: str, propagate_to_children: bool = True) -> dict[str, Any]:
     try:
         with _agent_graph_lock:
-            if agent_id not in _agent_graph["nodes"]:
+            agent_node = _agent_graph["nodes"].get(agent_id)
+            if agent_node is None:
                 return {
                     "success": False,
                     "error": f"Agent '{agent_id}' not found in graph",
                     "agent_id": agent_id,
                 }
 
-            agent_node = _agent_graph["nodes"][agent_id]
-
             if agent_node["status"] in ["completed", "error", "failed", "stopped"]:
                 return {
                     "success": True,
@@ -561,12 +624,12 @@ def stop_agent(agent_id: str, propagate_to_children: bool = True) -> dict[str, A
             # Phase 3: Stop child agents first (depth-first propagation)
             stopped_children = _stop_child_agents(agent_id) if propagate_to_children else []
 
-            if agent_id in _agent_states:
-                agent_state = _agent_states[agent_id]
+            agent_state = _agent_states.get(agent_id)
+            if agent_state is not None:
                 agent_state.request_stop()
 
-            if agent_id in _agent_instances:
-                agent_instance = _agent_instances[agent_id]
+            agent_instance = _agent_instances.get(agent_id)
+            if agent_instance is not None:
                 if hasattr(agent_instance, "state"):
                     agent_instance.state.request_stop()
                 if hasattr(agent_instance, "cancel_current_execution"):
@@ -574,14 +637,9 @@ def stop_agent(agent_id: str, propagate_to_children: bool = True) -> dict[str, A
 
             agent_node["status"] = "stopping"
 
-            try:
-                from strix.telemetry.tracer import get_global_tracer
-
-                tracer = get_global_tracer()
-                if tracer:
-                    tracer.update_agent_status(agent_id, "stopping")
-            except (ImportError, AttributeError):
-                pass
+            tracer = get_global_tracer()
+            if tracer:
+                tracer.update_agent_status(agent_id, "stopping")
 
             agent_node["result"] = {
                 "summary": "Agent stop requested by user",
@@ -612,33 +670,26 @@ def stop_agent(agent_id: str, propagate_to_children: bool = True) -> dict[str, A
 def send_user_message_to_agent(agent_id: str, message: str) -> dict[str, Any]:
     try:
         with _agent_graph_lock:
-            if agent_id not in _agent_graph["nodes"]:
+            agent_node = _agent_graph["nodes"].get(agent_id)
+            if agent_node is None:
                 return {
                     "success": False,
                     "error": f"Agent '{agent_id}' not found in graph",
                     "agent_id": agent_id,
                 }
 
-            agent_node = _agent_graph["nodes"][agent_id]
-
-            if agent_id not in _agent_messages:
-                _agent_messages[agent_id] = []
-
-            from uuid import uuid4
-
-            message_data = {
-                "id": f"user_msg_{uuid4().hex[:8]}",
-                "from": "user",
-                "to": agent_id,
-                "content": message,
-                "message_type": "instruction",
-                "priority": "high",
-                "timestamp": datetime.now(UTC).isoformat(),
-                "delivered": True,
-                "read": False,
-            }
+            message_data = AgentMessage(
+                id=f"user_msg_{uuid4().hex[:8]}",
+                from_="user",
+                to=agent_id,
+                content=message,
+                message_type="instruction",
+                priority="high",
+                timestamp=datetime.now(UTC).isoformat(),
+                delivered=True,
+            )
 
-            _agent_messages[agent_id].append(message_data)
+            _agent_messages.setdefault(agent_id, deque()).append(message_data)
 
             return {
                 "success": True,
@@ -667,18 +718,14 @@ def wait_for_message(
         agent_state.enter_waiting_state()
 
         with _agent_graph_lock:
-            if agent_id in _agent_graph["nodes"]:
-                _agent_graph["nodes"][agent_id]["status"] = "waiting"
-                _agent_graph["nodes"][agent_id]["waiting_reason"] = reason
-
-        try:
-            from strix.telemetry.tracer import get_global_tracer
+            agent_node = _agent_graph["nodes"].get(agent_id)
+            if agent_node is not None:
+                agent_node["status"] = "waiting"
+                agent_node["waiting_reason"] = reason
 
-            tracer = get_global_tracer()
-            if tracer:
-                tracer.update_agent_status(agent_id, "waiting")
-        except (ImportError, AttributeError):
-            pass
+        tracer = get_global_tracer()
+        if tracer:
+            tracer.update_agent_status(agent_id, "waiting")
 
     except Exception as e:  # noqa: BLE001
         return {"success": False, "error": f"Failed to enter waiting state: {e}", "status": "error"}
@@ -722,12 +769,12 @@ def cleanup_all_agents(timeout: float = 5.0) -> dict[str, Any]:
         # Stop all running agents
         for agent_id in list(_running_agents.keys()):
             try:
-                if agent_id in _agent_states:
-                    _agent_states[agent_id].request_stop()
-                if agent_id in _agent_instances:
-                    inst = _agent_instances[agent_id]
-                    if hasattr(inst, "cancel_current_execution"):
-                        inst.cancel_current_execution()
+                agent_state = _agent_states.get(agent_id)
+                if agent_state is not None:
+                    agent_state.request_stop()
+                inst = _agent_instances.get(agent_id)
+                if hasattr(inst, "cancel_current_execution"):
+                    inst.cancel_current_execution()
                 stopped.append(agent_id)
             except Exception as e:  # noqa: BLE001
                 failed.append((agent_id, str(e)))
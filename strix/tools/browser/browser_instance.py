@@ -1,11 +1,14 @@
 import asyncio
 import base64
+import contextlib
 import logging
 import threading
+from collections import deque
 from pathlib import Path
-from typing import Any, cast
+from typing import Any, Literal, cast
 
 from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 
 logger = logging.getLogger(__name__)
@@ -15,6 +18,16 @@ MAX_CONSOLE_LOG_LENGTH = 30_000
 MAX_INDIVIDUAL_LOG_LENGTH = 1_000
 MAX_CONSOLE_LOGS_COUNT = 200
 MAX_JS_RESULT_LENGTH = 5_000
+# JPEG encodes several times faster than PNG and yields a much smaller payload
+SCREENSHOT_TYPE: Literal["jpeg", "png"] = "jpeg"
+SCREENSHOT_QUALITY = 80
+# Upper bound on waiting for network activity to settle before capturing page state
+PAGE_SETTLE_TIMEOUT_MS = 2_000
+# How long an interaction (click, typing, key press, JS) is given to start a navigation or
+# update the page in place before its state is captured
+ACTION_SETTLE_MS = 500
+# Upper bound on waiting for a navigation started by an interaction to load
+NAVIGATION_TIMEOUT_MS = 10_000
 
 
 class BrowserInstance:
@@ -29,7 +42,11 @@ class BrowserInstance:
         self.current_page_id: str | None = None
         self._next_tab_id = 1
 
-        self.console_logs: dict[str, list[dict[str, Any]]] = {}
+        # Entries are stored with their rendered length so truncation never re-serializes them
+        self.console_logs: dict[str, deque[tuple[dict[str, Any], int]]] = {}
+        self._console_logs_length: dict[str, int] = {}
+        # Per tab: set when a main-frame navigation starts, and when it commits or fails
+        self._navigation_events: dict[str, tuple[asyncio.Event, asyncio.Event]] = {}
 
         self._loop: asyncio.AbstractEventLoop | None = None
         self._loop_thread: threading.Thread | None = None
@@ -37,16 +54,20 @@ class BrowserInstance:
         self._start_event_loop()
 
     def _start_event_loop(self) -> None:
+        ready = threading.Event()
+
         def run_loop() -> None:
-            self._loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self._loop)
-            self._loop.run_forever()
+            loop = asyncio.new_event_loop()
+            # Run scheduled coroutines synchronously up to their first suspension point
+            loop.set_task_factory(asyncio.eager_task_factory)
+            asyncio.set_event_loop(loop)
+            self._loop = loop
+            ready.set()
+            loop.run_forever()
 
         self._loop_thread = threading.Thread(target=run_loop, daemon=True)
         self._loop_thread.start()
-
-        while self._loop is None:
-            threading.Event().wait(0.01)
+        ready.wait()
 
     def _run_async(self, coro: Any) -> dict[str, Any]:
         if not self._loop or not self.is_running:
@@ -56,7 +77,8 @@ class BrowserInstance:
         return cast("dict[str, Any]", future.result(timeout=30))  # 30 second timeout
 
     async def _setup_console_logging(self, page: Page, tab_id: str) -> None:
-        self.console_logs[tab_id] = []
+        self.console_logs[tab_id] = deque(maxlen=MAX_CONSOLE_LOGS_COUNT)
+        self._console_logs_length[tab_id] = 0
 
         def handle_console(msg: Any) -> None:
             text = msg.text
@@ -70,13 +92,41 @@ class BrowserInstance:
                 "timestamp": asyncio.get_event_loop().time(),
             }
 
-            self.console_logs[tab_id].append(log_entry)
+            logs = self.console_logs[tab_id]
+            if len(logs) == logs.maxlen:
+                self._console_logs_length[tab_id] -= logs[0][1]
 
-            if len(self.console_logs[tab_id]) > MAX_CONSOLE_LOGS_COUNT:
-                self.console_logs[tab_id] = self.console_logs[tab_id][-MAX_CONSOLE_LOGS_COUNT:]
+            log_length = len(str(log_entry))
+            logs.append((log_entry, log_length))
+            self._console_logs_length[tab_id] += log_length
 
         page.on("console", handle_console)
 
+    async def _setup_navigation_tracking(self, page: Page, tab_id: str) -> None:
+        started, resolved = asyncio.Event(), asyncio.Event()
+        self._navigation_events[tab_id] = (started, resolved)
+
+        def is_main_navigation(request: Any) -> bool:
+            return bool(request.is_navigation_request() and request.frame == page.main_frame)
+
+        def handle_request(request: Any) -> None:
+            if is_main_navigation(request):
+                started.set()
+
+        def handle_request_failed(request: Any) -> None:
+            # Aborted navigations (downloads, blocked requests) never commit
+            if is_main_navigation(request):
+                resolved.set()
+
+        def handle_frame_navigated(frame: Any) -> None:
+            if frame == page.main_frame:
+                started.set()
+                resolved.set()
+
+        page.on("request", handle_request)
+        page.on("requestfailed", handle_request_failed)
+        page.on("framenavigated", handle_frame_navigated)
+
     async def _launch_browser(self, url: str | None = None) -> dict[str, Any]:
         self.playwright = await async_playwright().start()
 
@@ -105,12 +155,22 @@ class BrowserInstance:
         self.current_page_id = tab_id
 
         await self._setup_console_logging(page, tab_id)
+        await self._setup_navigation_tracking(page, tab_id)
 
         if url:
             await page.goto(url, wait_until="domcontentloaded")
+            await self._wait_for_network_idle(page)
 
         return await self._get_page_state(tab_id)
 
+    async def _take_screenshot(self, page: Page) -> bytes:
+        if SCREENSHOT_TYPE == "jpeg":
+            return await page.screenshot(type="jpeg", quality=SCREENSHOT_QUALITY, full_page=False)
+        return await page.screenshot(type="png", full_page=False)
+
+    async def _get_tab_title(self, page: Page) -> str:
+        return await page.title() if not page.is_closed() else "Closed"
+
     async def _get_page_state(self, tab_id: str | None = None) -> dict[str, Any]:
         if not tab_id:
             tab_id = self.current_page_id
@@ -120,22 +180,22 @@ class BrowserInstance:
 
         page = self.pages[tab_id]
 
-        await asyncio.sleep(2)
-
-        screenshot_bytes = await page.screenshot(type="png", full_page=False)
+        tabs = list(self.pages.items())
+        screenshot_bytes, titles = await asyncio.gather(
+            self._take_screenshot(page),
+            asyncio.gather(*(self._get_tab_title(tab_page) for _, tab_page in tabs)),
+        )
         screenshot_b64 = base64.b64encode(screenshot_bytes).decode("utf-8")
 
+        all_tabs = {
+            tid: {"url": tab_page.url, "title": title}
+            for (tid, tab_page), title in zip(tabs, titles, strict=True)
+        }
+
         url = page.url
-        title = await page.title()
+        title = all_tabs[tab_id]["title"]
         viewport = page.viewport_size
 
-        all_tabs = {}
-        for tid, tab_page in self.pages.items():
-            all_tabs[tid] = {
-                "url": tab_page.url,
-                "title": await tab_page.title() if not tab_page.is_closed() else "Closed",
-            }
-
         return {
             "screenshot": screenshot_b64,
             "url": url,
@@ -145,6 +205,30 @@ class BrowserInstance:
             "all_tabs": all_tabs,
         }
 
+    async def _wait_for_network_idle(self, page: Page) -> None:
+        # Only meaningful right after a navigation: the load state is not re-armed for
+        # activity on an already idle document
+        with contextlib.suppress(PlaywrightTimeoutError):
+            await page.wait_for_load_state("networkidle", timeout=PAGE_SETTLE_TIMEOUT_MS)
+
+    def _begin_action(self, tab_id: str) -> None:
+        for event in self._navigation_events[tab_id]:
+            event.clear()
+
+    async def _settle_after_action(self, tab_id: str, settle_ms: int = ACTION_SETTLE_MS) -> None:
+        started, resolved = self._navigation_events[tab_id]
+        try:
+            await asyncio.wait_for(started.wait(), settle_ms / 1000)
+        except TimeoutError:
+            # No navigation: the bounded wait gave in-page updates and requests time to land
+            return
+
+        page = self.pages[tab_id]
+        with contextlib.suppress(TimeoutError, PlaywrightTimeoutError):
+            await asyncio.wait_for(resolved.wait(), NAVIGATION_TIMEOUT_MS / 1000)
+            await page.wait_for_load_state("domcontentloaded", timeout=NAVIGATION_TIMEOUT_MS)
+            await self._wait_for_network_idle(page)
+
     def launch(self, url: str | None = None) -> dict[str, Any]:
         with self._execution_lock:
             if self.browser is not None:
@@ -165,6 +249,7 @@ class BrowserInstance:
 
         page = self.pages[tab_id]
         await page.goto(url, wait_until="domcontentloaded")
+        await self._wait_for_network_idle(page)
 
         return await self._get_page_state(tab_id)
 
@@ -185,7 +270,9 @@ class BrowserInstance:
             raise ValueError(f"Invalid coordinate format: {coordinate}. Use 'x,y'") from e
 
         page = self.pages[tab_id]
+        self._begin_action(tab_id)
         await page.mouse.click(x, y)
+        await self._settle_after_action(tab_id)
 
         return await self._get_page_state(tab_id)
 
@@ -201,7 +288,9 @@ class BrowserInstance:
             raise ValueError(f"Tab '{tab_id}' not found")
 
         page = self.pages[tab_id]
+        self._begin_action(tab_id)
         await page.keyboard.type(text)
+        await self._settle_after_action(tab_id)
 
         return await self._get_page_state(tab_id)
 
@@ -219,12 +308,16 @@ class BrowserInstance:
         page = self.pages[tab_id]
 
         if direction == "down":
-            await page.keyboard.press("PageDown")
+            key = "PageDown"
         elif direction == "up":
-            await page.keyboard.press("PageUp")
+            key = "PageUp"
         else:
             raise ValueError(f"Invalid scroll direction: {direction}")
 
+        self._begin_action(tab_id)
+        await page.keyboard.press(key)
+        await self._settle_after_action(tab_id)
+
         return await self._get_page_state(tab_id)
 
     def back(self, tab_id: str | None = None) -> dict[str, Any]:
@@ -240,6 +333,7 @@ class BrowserInstance:
 
         page = self.pages[tab_id]
         await page.go_back(wait_until="domcontentloaded")
+        await self._wait_for_network_idle(page)
 
         return await self._get_page_state(tab_id)
 
@@ -256,6 +350,7 @@ class BrowserInstance:
 
         page = self.pages[tab_id]
         await page.go_forward(wait_until="domcontentloaded")
+        await self._wait_for_network_idle(page)
 
         return await self._get_page_state(tab_id)
 
@@ -274,9 +369,11 @@ class BrowserInstance:
         self.current_page_id = tab_id
 
         await self._setup_console_logging(page, tab_id)
+        await self._setup_navigation_tracking(page, tab_id)
 
         if url:
             await page.goto(url, wait_until="domcontentloaded")
+            await self._wait_for_network_idle(page)
 
         return await self._get_page_state(tab_id)
 
@@ -305,8 +402,9 @@ class BrowserInstance:
         page = self.pages.pop(tab_id)
         await page.close()
 
-        if tab_id in self.console_logs:
-            del self.console_logs[tab_id]
+        self.console_logs.pop(tab_id, None)
+        self._console_logs_length.pop(tab_id, None)
+        self._navigation_events.pop(tab_id, None)
 
         if self.current_page_id == tab_id:
             self.current_page_id = next(iter(self.pages.keys()))
@@ -334,6 +432,7 @@ class BrowserInstance:
 
         page = self.pages[tab_id]
 
+        self._begin_action(tab_id)
         try:
             result = await page.evaluate(js_code)
         except Exception as e:  # noqa: BLE001
@@ -342,6 +441,7 @@ class BrowserInstance:
                 "error_type": type(e).__name__,
                 "error_message": str(e),
             }
+        await self._settle_after_action(tab_id)
 
         result_str = str(result)
         if len(result_str) > MAX_JS_RESULT_LENGTH:
@@ -364,26 +464,24 @@ class BrowserInstance:
         if not tab_id or tab_id not in self.pages:
             raise ValueError(f"Tab '{tab_id}' not found")
 
-        logs = self.console_logs.get(tab_id, [])
+        entries = list(self.console_logs.get(tab_id, ()))
 
-        total_length = sum(len(str(log)) for log in logs)
-        if total_length > MAX_CONSOLE_LOG_LENGTH:
+        if self._console_logs_length.get(tab_id, 0) > MAX_CONSOLE_LOG_LENGTH:
             truncated_logs: list[dict[str, Any]] = []
             current_length = 0
 
-            for log in reversed(logs):
-                log_length = len(str(log))
-                if current_length + log_length <= MAX_CONSOLE_LOG_LENGTH:
-                    truncated_logs.insert(0, log)
-                    current_length += log_length
-                else:
+            for log, log_length in reversed(entries):
+                if current_length + log_length > MAX_CONSOLE_LOG_LENGTH:
                     break
+                truncated_logs.append(log)
+                current_length += log_length
+            truncated_logs.reverse()
 
-            if len(truncated_logs) < len(logs):
+            if len(truncated_logs) < len(entries):
                 truncation_notice = {
                     "type": "info",
                     "text": (
-                        f"[TRUNCATED: {len(logs) - len(truncated_logs)} older logs removed to stay within {MAX_CONSOLE_LOG_LENGTH} character limit]"
+                        f"[TRUNCATED: {len(entries) - len(truncated_logs)} older logs removed to stay within {MAX_CONSOLE_LOG_LENGTH} character limit]"
                     ),
                     "location": {},
                     "timestamp": 0,
@@ -391,9 +489,12 @@ class BrowserInstance:
                 truncated_logs.insert(0, truncation_notice)
 
             logs = truncated_logs
+        else:
+            logs = [log for log, _ in entries]
 
-        if clear:
-            self.console_logs[tab_id] = []
+        if clear and tab_id in self.console_logs:
+            self.console_logs[tab_id].clear()
+            self._console_logs_length[tab_id] = 0
 
         state = await self._get_page_state(tab_id)
         state["console_logs"] = logs
@@ -442,7 +543,9 @@ class BrowserInstance:
             raise ValueError(f"Invalid coordinate format: {coordinate}. Use 'x,y'") from e
 
         page = self.pages[tab_id]
+        self._begin_action(tab_id)
         await page.mouse.dblclick(x, y)
+        await self._settle_after_action(tab_id)
 
         return await self._get_page_state(tab_id)
 
@@ -463,7 +566,9 @@ class BrowserInstance:
             raise ValueError(f"Invalid coordinate format: {coordinate}. Use 'x,y'") from e
 
         page = self.pages[tab_id]
+        self._begin_action(tab_id)
         await page.mouse.move(x, y)
+        await self._settle_after_action(tab_id)
 
         return await self._get_page_state(tab_id)
 
@@ -479,7 +584,9 @@ class BrowserInstance:
             raise ValueError(f"Tab '{tab_id}' not found")
 
         page = self.pages[tab_id]
+        self._begin_action(tab_id)
         await page.keyboard.press(key)
+        await self._settle_after_action(tab_id)
 
         return await self._get_page_state(tab_id)
 
@@ -187,7 +187,9 @@ def _format_tool_result(tool_name: str, result: Any) -> tuple[str, list[dict[str
         images.append(
             {
                 "type": "image_url",
-                "image_url": {"url": f"data:image/png;base64,{screenshot_data}"},
+                "image_url": {
+                    "url": f"data:{_screenshot_mime_type(screenshot_data)};base64,{screenshot_data}"
+                },
             }
         )
         result_str = remove_screenshot_from_result(result)
@@ -390,6 +392,11 @@ def extract_screenshot_from_result(result: Any) -> str | None:
     return None
 
 
+def _screenshot_mime_type(screenshot_b64: str) -> str:
+    # Base64 of the JPEG magic bytes (FF D8 FF); anything else is treated as PNG
+    return "image/jpeg" if screenshot_b64.startswith("/9j/") else "image/png"
+
+
 def remove_screenshot_from_result(result: Any) -> Any:
     if not isinstance(result, dict):
         return result
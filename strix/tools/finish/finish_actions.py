@@ -26,7 +26,7 @@ def _validate_content(content: str) -> dict[str, Any] | None:
 
 def _check_active_agents(agent_state: Any = None) -> dict[str, Any] | None:
     try:
-        from strix.tools.agents_graph.agents_graph_actions import _agent_graph
+        from strix.tools.agents_graph.agents_graph_actions import _agent_graph, _agent_graph_lock
 
         current_agent_id = None
         if agent_state and hasattr(agent_state, "agent_id"):
@@ -35,7 +35,10 @@ def _check_active_agents(agent_state: Any = None) -> dict[str, Any] | None:
         running_agents = []
         stopping_agents = []
 
-        for agent_id, node in _agent_graph.get("nodes", {}).items():
+        with _agent_graph_lock:
+            nodes = list(_agent_graph.get("nodes", {}).items())
+
+        for agent_id, node in nodes:
             if agent_id == current_agent_id:
                 continue
 
@@ -200,7 +203,7 @@ def _finalize_with_tracer(content: str, success: bool) -> dict[str, Any]:
             if rejected_count > 0:
                 result["false_positives_rejected"] = rejected_count
                 result["note"] = (
-                    f"{rejected_count} potential finding(s) were rejected during verification. See rejected_false_positives/ directory for details."
+                    f"{rejected_count} potential finding(s) were rejected during verification. See rejected_false_positives.jsonl for details."
                 )
 
             return result
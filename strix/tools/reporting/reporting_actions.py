@@ -137,9 +137,13 @@ def _spawn_verification_agent(  # noqa: PLR0912, PLR0915
         if parent_agent_state and hasattr(parent_agent_state, "agent_id"):
             try:
                 from strix.llm.config import LLMConfig
-                from strix.tools.agents_graph.agents_graph_actions import _agent_instances
+                from strix.tools.agents_graph.agents_graph_actions import (
+                    _agent_graph_lock,
+                    _agent_instances,
+                )
 
-                parent_agent = _agent_instances.get(parent_agent_state.agent_id)
+                with _agent_graph_lock:
+                    parent_agent = _agent_instances.get(parent_agent_state.agent_id)
                 if parent_agent and hasattr(parent_agent, "llm_config"):
                     parent_config = parent_agent.llm_config
                     # Create new config with verification module but inherited timeout/scan_mode
@@ -166,30 +170,32 @@ def _spawn_verification_agent(  # noqa: PLR0912, PLR0915
         try:
             from strix.tools.agents_graph.agents_graph_actions import (
                 _agent_graph,
+                _agent_graph_lock,
                 _agent_instances,
             )
 
-            _agent_graph["nodes"][state.agent_id] = {
-                "name": state.agent_name,
-                "task": task,
-                "status": "running",
-                "created_at": datetime.now(UTC).isoformat(),
-                "parent_id": parent_id,
-                "type": "verification",
-                "report_id": report_id,
-            }
+            with _agent_graph_lock:
+                _agent_graph["nodes"][state.agent_id] = {
+                    "name": state.agent_name,
+                    "task": task,
+                    "status": "running",
+                    "created_at": datetime.now(UTC).isoformat(),
+                    "parent_id": parent_id,
+                    "type": "verification",
+                    "report_id": report_id,
+                }
 
-            if parent_id:
-                _agent_graph["edges"].append(
-                    {
-                        "from": parent_id,
-                        "to": state.agent_id,
-                        "type": "spawned_verification",
-                        "created_at": datetime.now(UTC).isoformat(),
-                    }
-                )
+                if parent_id:
+                    _agent_graph["edges"].append(
+                        {
+                            "from": parent_id,
+                            "to": state.agent_id,
+                            "type": "spawned_verification",
+                            "created_at": datetime.now(UTC).isoformat(),
+                        }
+                    )
 
-            _agent_instances[state.agent_id] = agent
+                _agent_instances[state.agent_id] = agent
         except ImportError:
             logger.debug("Agent graph not available - verification agent not registered")
 
@@ -234,10 +240,12 @@ def _spawn_verification_agent(  # noqa: PLR0912, PLR0915
                 # Clean up running agents
                 try:
                     from strix.tools.agents_graph.agents_graph_actions import (
-                        _running_agents as running,
+                        _agent_graph_lock,
+                        _running_agents,
                     )
 
-                    running.pop(state.agent_id, None)
+                    with _agent_graph_lock:
+                        _running_agents.pop(state.agent_id, None)
                 except ImportError:
                     pass
 
@@ -250,10 +258,12 @@ def _spawn_verification_agent(  # noqa: PLR0912, PLR0915
         # Register the running thread BEFORE starting to avoid race condition
         try:
             from strix.tools.agents_graph.agents_graph_actions import (
-                _running_agents as running,
+                _agent_graph_lock,
+                _running_agents,
             )
 
-            running[state.agent_id] = thread
+            with _agent_graph_lock:
+                _running_agents[state.agent_id] = thread
         except ImportError:
             pass
 
@@ -293,15 +303,18 @@ def _update_verification_agent_status(agent_id: str, status: str) -> None:
 
         from strix.tools.agents_graph.agents_graph_actions import (
             _agent_graph,
+            _agent_graph_lock,
             _agent_instances,
         )
 
-        if agent_id in _agent_graph["nodes"]:
-            _agent_graph["nodes"][agent_id]["status"] = status
-            _agent_graph["nodes"][agent_id]["finished_at"] = datetime.now(UTC).isoformat()
+        with _agent_graph_lock:
+            node = _agent_graph["nodes"].get(agent_id)
+            if node is not None:
+                node["status"] = status
+                node["finished_at"] = datetime.now(UTC).isoformat()
 
-        # Clean up instance reference
-        _agent_instances.pop(agent_id, None)
+            # Clean up instance reference
+            _agent_instances.pop(agent_id, None)
 
     except ImportError:
         pass
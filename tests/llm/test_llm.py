@@ -0,0 +1,200 @@
+from typing import Any
+
+import litellm
+import pytest
+from pytest_mock import MockerFixture
+
+from strix.llm import LLM, LLMConfig, LLMRequestFailedError
+from strix.llm.llm import (
+    REASONING_EFFORT_PATTERNS,
+    SUPPORTS_STOP_WORDS_FALSE_PATTERNS,
+    _describe_llm_error,
+    compile_model_patterns,
+    model_matches,
+    normalize_model_name,
+)
+
+
+class TestNormalizeModelName:
+    """Tests for the normalize_model_name function."""
+
+    @pytest.mark.parametrize(
+        ("model", "expected"),
+        [
+            ("gpt-5", "gpt-5"),
+            ("openai/gpt-5", "gpt-5"),
+            ("  OpenAI/GPT-5  ", "gpt-5"),
+            ("ollama/qwen3:32b", "qwen3"),
+            ("openrouter/deepseek/deepseek-r1-0528", "deepseek-r1-0528"),
+            ("lmstudio/llama-3-gguf", "llama-3"),
+            ("", ""),
+        ],
+    )
+    def test_normalization(self, model: str, expected: str) -> None:
+        """Test that provider prefixes, tags and gguf suffixes are stripped."""
+        assert normalize_model_name(model) == expected
+
+
+class TestModelMatches:
+    """Tests for compiled model pattern matching."""
+
+    @pytest.mark.parametrize(
+        ("model", "expected"),
+        [
+            ("openai/o1", True),
+            ("openai/o1-mini", True),
+            ("xai/grok-4-0709", True),
+            ("deepseek/deepseek-r1-0528:free", True),
+            ("openai/gpt-5", False),
+            ("anthropic/claude-sonnet-4-5", False),
+        ],
+    )
+    def test_stop_words_patterns(self, model: str, expected: bool) -> None:
+        """Test matching against the stop-word exclusion patterns."""
+        matcher = compile_model_patterns(SUPPORTS_STOP_WORDS_FALSE_PATTERNS)
+        assert model_matches(model, matcher) is expected
+
+    @pytest.mark.parametrize(
+        ("model", "expected"),
+        [
+            ("openai/gpt-5", True),
+            ("openai/gpt-5-mini", True),
+            ("anthropic/claude-sonnet-4-5-20250929", True),
+            ("openai/o3", True),
+            ("openai/o3-pro", False),
+            ("openai/gpt-4o", False),
+        ],
+    )
+    def test_reasoning_effort_patterns(self, model: str, expected: bool) -> None:
+        """Test matching against the reasoning effort patterns."""
+        matcher = compile_model_patterns(REASONING_EFFORT_PATTERNS)
+        assert model_matches(model, matcher) is expected
+
+    def test_slash_patterns_match_full_model_string(self) -> None:
+        """Test that patterns containing a slash match the raw model string."""
+        matcher = compile_model_patterns(["azure/*", "gpt-4o"])
+        assert model_matches("Azure/my-deployment", matcher) is True
+        assert model_matches("openai/gpt-4o", matcher) is True
+        assert model_matches("openai/my-deployment", matcher) is False
+
+    def test_empty_patterns(self) -> None:
+        """Test that an empty pattern list never matches."""
+        assert model_matches("openai/gpt-5", compile_model_patterns([])) is False
+
+
+class TestCacheInterval:
+    """Tests for the prompt caching interval calculation."""
+
+    @pytest.mark.parametrize(
+        ("total_messages", "expected"),
+        [(0, 10), (1, 10), (2, 10), (40, 10), (41, 20), (80, 20), (81, 30), (401, 110)],
+    )
+    def test_interval_caps_cache_points(self, total_messages: int, expected: int) -> None:
+        """Test that the interval is the smallest multiple of 10 giving at most 3 points."""
+        llm = LLM(LLMConfig(model_name="anthropic/claude-sonnet-4-5"))
+        interval = llm._calculate_cache_interval(total_messages)
+        assert interval == expected
+        assert max(total_messages - 1, 0) // interval <= 3
+
+
+class TestDescribeLLMError:
+    """Tests for mapping litellm exceptions to user-facing messages."""
+
+    def test_exact_exception_type(self) -> None:
+        """Test that a mapped exception type resolves to its message."""
+        error = litellm.Timeout(message="slow", model="m", llm_provider="p")
+        assert _describe_llm_error(error) == "Request timed out"
+
+    def test_exception_subclass(self) -> None:
+        """Test that unmapped subclasses resolve through their mapped base class."""
+
+        class CustomRateLimitError(litellm.RateLimitError):
+            pass
+
+        error = CustomRateLimitError(message="slow down", model="m", llm_provider="p")
+        assert _describe_llm_error(error) == "Rate limit exceeded"
+
+    def test_unknown_exception_uses_type_name(self) -> None:
+        """Test that exceptions outside litellm fall back to the class name."""
+        assert _describe_llm_error(ValueError("boom")) == "ValueError"
+
+
+class TestPrepareCachedMessages:
+    """Tests for placing prompt caching breakpoints."""
+
+    def test_system_prompt_split_at_shared_boundary(self) -> None:
+        """Test that the shared system prompt prefix gets its own breakpoint."""
+        llm = LLM(LLMConfig(model_name="anthropic/claude-sonnet-4-5"))
+        system = "shared rules\n<specialized_knowledge>\nagent modules"
+        messages = [{"role": "system", "content": system}] + [
+            {"role": "user", "content": str(i)} for i in range(60)
+        ]
+
+        cached = llm._prepare_cached_messages(messages)
+
+        blocks = cached[0]["content"]
+        assert [block["text"] for block in blocks] == [
+            "shared rules\n",
+            "<specialized_knowledge>\nagent modules",
+        ]
+        assert all("cache_control" in block for block in blocks)
+        history_points = [
+            i for i, msg in enumerate(cached[1:], 1) if isinstance(msg["content"], list)
+        ]
+        assert len(blocks) + len(history_points) <= 4
+        assert messages[0]["content"] == system
+
+
+class TestDeduplicateHistory:
+    """Tests for exact-text deduplication of conversation history."""
+
+    def test_repeated_large_blocks_are_replaced(self) -> None:
+        """Test that repeated large messages are replaced with a back-reference."""
+        llm = LLM(LLMConfig(deduplicate_history=True))
+        block = "x" * 1000
+        history = [
+            {"role": "user", "content": block},
+            {"role": "assistant", "content": "short"},
+            {"role": "user", "content": block},
+            {"role": "assistant", "content": block},
+        ]
+
+        deduplicated = llm._deduplicate_history(history)
+
+        assert deduplicated[0] is history[0]
+        assert deduplicated[2]["content"] == "[deduped: identical to message 1 above]"
+        assert deduplicated[3]["content"] == block
+        assert history[2]["content"] == block
+
+    def test_unique_history_is_returned_unchanged(self) -> None:
+        """Test that history without duplicates is returned as the same list."""
+        llm = LLM(LLMConfig(deduplicate_history=True))
+        history = [{"role": "user", "content": "a" * 600}, {"role": "user", "content": "short"}]
+        assert llm._deduplicate_history(history) is history
+
+    async def test_back_references_number_the_messages_sent(self, mocker: MockerFixture) -> None:
+        """Test that back-references count the system and identity messages ahead of history."""
+        llm = LLM(LLMConfig(deduplicate_history=True))
+        llm.set_agent_identity("root", "agent-1")
+        block = "x" * 1000
+        sent: list[list[dict[str, Any]]] = []
+
+        async def capture(messages: list[dict[str, Any]]) -> None:
+            sent.append(messages)
+            raise RuntimeError("stop")
+
+        mocker.patch.object(llm, "_make_request", side_effect=capture)
+
+        with pytest.raises(LLMRequestFailedError):
+            await llm.generate([{"role": "user", "content": block}] * 2)
+
+        [messages] = sent
+        assert messages[2]["content"] == block
+        assert messages[3]["content"] == "[deduped: identical to message 3 above]"
+
+    def test_enabled_from_environment(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that LLM_DEDUPLICATE_HISTORY enables deduplication unless set explicitly."""
+        monkeypatch.setenv("LLM_DEDUPLICATE_HISTORY", "true")
+
+        assert LLMConfig().deduplicate_history is True
+        assert LLMConfig(deduplicate_history=False).deduplicate_history is False
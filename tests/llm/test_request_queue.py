@@ -0,0 +1,158 @@
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from litellm import ModelResponse
+from pytest_mock import MockerFixture
+
+from strix.llm.request_queue import LLMRequestQueue
+
+
+if TYPE_CHECKING:
+    from unittest.mock import MagicMock
+
+
+def _make_queue(coalesce_requests: bool) -> LLMRequestQueue:
+    return LLMRequestQueue(
+        max_concurrent=1, delay_between_requests=0, coalesce_requests=coalesce_requests
+    )
+
+
+def _args(content: str) -> dict[str, Any]:
+    return {"model": "openai/gpt-5", "messages": [{"role": "user", "content": content}]}
+
+
+class TestLLMRequestQueue:
+    """Tests for LLMRequestQueue request dispatching."""
+
+    async def test_single_request_skips_batching(self, mocker: MockerFixture) -> None:
+        """Test that an uncontended request goes through the regular completion path."""
+        response = ModelResponse()
+        completion = mocker.patch("strix.llm.request_queue.completion", return_value=response)
+        batch = mocker.patch("strix.llm.request_queue.batch_completion")
+
+        queue = _make_queue(coalesce_requests=True)
+        result = await queue.make_request(_args("hi"))
+
+        assert result is response
+        completion.assert_called_once()
+        batch.assert_not_called()
+
+    async def test_waiting_requests_are_coalesced(self, mocker: MockerFixture) -> None:
+        """Test that requests queued behind a busy slot are sent as one batch."""
+        responses = [ModelResponse(), ModelResponse(), ModelResponse()]
+        batch = mocker.patch(
+            "strix.llm.request_queue.batch_completion", return_value=list(responses)
+        )
+        completion = mocker.patch("strix.llm.request_queue.completion")
+
+        queue = _make_queue(coalesce_requests=True)
+        queue._semaphore.acquire()
+        tasks = [asyncio.create_task(queue.make_request(_args(str(i)))) for i in range(3)]
+        await asyncio.sleep(0.05)
+        queue._semaphore.release()
+
+        results = await asyncio.gather(*tasks)
+
+        assert results == responses
+        batch.assert_called_once()
+        assert [m[0]["content"] for m in batch.call_args.kwargs["messages"]] == ["0", "1", "2"]
+        completion.assert_not_called()
+
+    async def test_different_parameters_are_not_coalesced(self, mocker: MockerFixture) -> None:
+        """Test that only requests with identical non-message arguments share a batch."""
+        completion = mocker.patch(
+            "strix.llm.request_queue.completion", side_effect=lambda **_: ModelResponse()
+        )
+        batch = mocker.patch("strix.llm.request_queue.batch_completion")
+
+        queue = _make_queue(coalesce_requests=True)
+        queue._semaphore.acquire()
+        first = asyncio.create_task(queue.make_request(_args("a")))
+        second = asyncio.create_task(queue.make_request({**_args("b"), "model": "other"}))
+        await asyncio.sleep(0.05)
+        queue._semaphore.release()
+
+        await asyncio.gather(first, second)
+
+        assert completion.call_count == 2
+        batch.assert_not_called()
+
+    async def test_batch_errors_are_routed_to_their_caller(self, mocker: MockerFixture) -> None:
+        """Test that a non-retryable failure in a batch only fails its own request."""
+        error = ValueError("bad request")
+        mocker.patch("strix.llm.request_queue.should_retry_exception", return_value=False)
+        mocker.patch(
+            "strix.llm.request_queue.batch_completion",
+            return_value=[ModelResponse(), error],
+        )
+
+        queue = _make_queue(coalesce_requests=True)
+        queue._semaphore.acquire()
+        ok = asyncio.create_task(queue.make_request(_args("ok")))
+        failing = asyncio.create_task(queue.make_request(_args("fail")))
+        await asyncio.sleep(0.05)
+        queue._semaphore.release()
+
+        assert isinstance(await ok, ModelResponse)
+        with pytest.raises(ValueError, match="bad request"):
+            await failing
+
+    async def test_cancelled_leader_requeues_waiting_requests(self, mocker: MockerFixture) -> None:
+        """Test that cancelling a batch leader does not leave its followers hanging."""
+        completion = mocker.patch(
+            "strix.llm.request_queue.completion", side_effect=lambda **_: ModelResponse()
+        )
+
+        queue = _make_queue(coalesce_requests=True)
+        queue._semaphore.acquire()
+        leader = asyncio.create_task(queue.make_request(_args("leader")))
+        await asyncio.sleep(0.05)
+        follower = asyncio.create_task(queue.make_request(_args("follower")))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        queue._semaphore.release()
+
+        assert isinstance(await asyncio.wait_for(follower, timeout=5), ModelResponse)
+        completion.assert_called_once()
+        assert completion.call_args.kwargs["messages"][0]["content"] == "follower"
+
+    async def test_cancelled_follower_is_left_out_of_the_batch(self, mocker: MockerFixture) -> None:
+        """Test that a follower cancelled while waiting neither breaks nor joins the batch."""
+        completion = mocker.patch(
+            "strix.llm.request_queue.completion", side_effect=lambda **_: ModelResponse()
+        )
+        batch = mocker.patch("strix.llm.request_queue.batch_completion")
+
+        queue = _make_queue(coalesce_requests=True)
+        queue._semaphore.acquire()
+        leader = asyncio.create_task(queue.make_request(_args("leader")))
+        await asyncio.sleep(0.05)
+        follower = asyncio.create_task(queue.make_request(_args("follower")))
+        await asyncio.sleep(0.05)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        queue._semaphore.release()
+
+        assert isinstance(await asyncio.wait_for(leader, timeout=5), ModelResponse)
+        batch.assert_not_called()
+        completion.assert_called_once()
+        assert completion.call_args.kwargs["messages"][0]["content"] == "leader"
+
+    async def test_coalescing_disabled_by_default(
+        self, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that requests are sent one by one unless coalescing is enabled."""
+        monkeypatch.delenv("LLM_REQUEST_COALESCING", raising=False)
+        completion: MagicMock = mocker.patch(
+            "strix.llm.request_queue.completion", side_effect=lambda **_: ModelResponse()
+        )
+
+        queue = LLMRequestQueue(delay_between_requests=0)
+        await asyncio.gather(*(queue.make_request(_args(str(i))) for i in range(2)))
+
+        assert queue.coalesce_requests is False
+        assert completion.call_count == 2
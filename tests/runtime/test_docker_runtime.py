@@ -0,0 +1,402 @@
+"""Tests for the Docker runtime."""
+
+import asyncio
+import io
+import tarfile
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from strix.runtime import docker_runtime, get_runtime
+from strix.runtime.docker_runtime import DockerRuntime, _shared_docker_client
+
+
+@pytest.fixture
+def runtime(mocker: MockerFixture) -> Iterator[DockerRuntime]:
+    """Create a DockerRuntime backed by a mocked Docker client."""
+    mocker.patch("strix.runtime.docker_runtime.docker.from_env", return_value=MagicMock())
+    _shared_docker_client.cache_clear()
+    yield DockerRuntime()
+    _shared_docker_client.cache_clear()
+
+
+class TestReadinessProbes:
+    """Tests for the container readiness probes."""
+
+    def test_caido_token_read_with_proxy_setup(
+        self, runtime: DockerRuntime, mocker: MockerFixture
+    ) -> None:
+        """Test that the Caido token is parsed from the combined entrypoint output."""
+        wait = mocker.patch.object(runtime, "_wait_for_tool_server")
+        container = MagicMock()
+        container.exec_run.return_value = MagicMock(
+            exit_code=0,
+            output=b"Waiting for Caido API to be ready...\nCAIDO_TOKEN:secret-token\n",
+        )
+
+        runtime._initialize_container(container, 8080, 9090, "tool-token")
+
+        assert container.exec_run.call_count == 2
+        launch_command = container.exec_run.call_args_list[1].args[0]
+        assert "CAIDO_API_TOKEN=secret-token " in launch_command
+        wait.assert_called_once_with(9090)
+
+    def test_tool_server_probe_gives_up_after_timeout(
+        self, runtime: DockerRuntime, mocker: MockerFixture
+    ) -> None:
+        """Test that an unreachable tool server does not block past the timeout."""
+        import httpx
+
+        get = mocker.patch("httpx.get", side_effect=httpx.ConnectError("refused"))
+
+        runtime._wait_for_tool_server(12345, timeout=0.1)
+
+        assert get.call_count >= 1
+
+
+class TestCopyLocalDirectory:
+    """Tests for copying local sources into the sandbox."""
+
+    def test_directory_is_streamed_as_tar(self, runtime: DockerRuntime, tmp_path: Path) -> None:
+        """Test that every file is uploaded under the target name in one archive."""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "app.py").write_text("print('hi')")
+        (tmp_path / "README.md").write_text("readme")
+
+        uploaded: dict[str, bytes] = {}
+
+        def put_archive(path: str, data: Any) -> bool:
+            uploaded[path] = b"".join(data)
+            return True
+
+        container = MagicMock()
+        container.put_archive.side_effect = put_archive
+
+        runtime._copy_local_directory_to_container(container, str(tmp_path), "target")
+
+        with tarfile.open(fileobj=io.BytesIO(uploaded["/workspace"])) as tar:
+            names = sorted(tar.getnames())
+            content = tar.extractfile("target/src/app.py")
+            assert content is not None
+            assert content.read() == b"print('hi')"
+        assert names == ["target/README.md", "target/src", "target/src/app.py"]
+
+    def test_failed_writer_does_not_end_upload_cleanly(
+        self, runtime: DockerRuntime, tmp_path: Path, mocker: MockerFixture
+    ) -> None:
+        """Test that a tar writer failing partway aborts the upload instead of ending it."""
+
+        def write_partial(fileobj: Any, *_args: Any, **_kwargs: Any) -> None:
+            fileobj.write(b"partial tar data")
+            raise PermissionError("unreadable file")
+
+        mocker.patch.object(runtime, "_write_directory_tar", side_effect=write_partial)
+        received: list[bytes] = []
+        stream_ended = False
+
+        def put_archive(_path: str, data: Any) -> bool:
+            nonlocal stream_ended
+            received.extend(data)
+            stream_ended = True
+            return True
+
+        container = MagicMock()
+        container.put_archive.side_effect = put_archive
+
+        with pytest.raises(PermissionError, match="unreadable file"):
+            runtime._stream_directory_to_container(container, tmp_path, "target")
+
+        assert b"".join(received) == b"partial tar data"
+        assert not stream_ended
+
+    def test_upload_error_keeps_writer_error_as_cause(
+        self, runtime: DockerRuntime, tmp_path: Path, mocker: MockerFixture
+    ) -> None:
+        """Test that a failed upload is chained to the writer failure that caused it."""
+        from docker.errors import APIError
+
+        writer_error = PermissionError("unreadable file")
+        mocker.patch.object(runtime, "_write_directory_tar", side_effect=writer_error)
+
+        def put_archive(_path: str, data: Any) -> bool:
+            try:
+                list(data)
+            except PermissionError:
+                raise APIError("upload aborted") from None
+            return True
+
+        container = MagicMock()
+        container.put_archive.side_effect = put_archive
+
+        with pytest.raises(APIError) as excinfo:
+            runtime._stream_directory_to_container(container, tmp_path, "target")
+
+        assert excinfo.value.__cause__ is writer_error
+
+    def test_archive_carries_pentester_ownership(
+        self, runtime: DockerRuntime, tmp_path: Path
+    ) -> None:
+        """Test that sources are archived as pentester so no chown pass is needed."""
+        for name in ("api", "web"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "main.py").write_text(name)
+
+        uploaded: list[bytes] = []
+
+        def put_archive(_path: str, data: Any) -> bool:
+            uploaded.append(b"".join(data))
+            return True
+
+        container = MagicMock()
+        container.put_archive.side_effect = put_archive
+        container.exec_run.return_value = MagicMock(exit_code=0, output=b"1001\n1002\n")
+
+        runtime._copy_local_sources_to_container(
+            container,
+            [
+                {"source_path": str(tmp_path / "api")},
+                {"source_path": str(tmp_path / "web"), "workspace_subdir": "frontend"},
+                {"workspace_subdir": "ignored"},
+            ],
+        )
+
+        assert len(uploaded) == 2
+        for archive in uploaded:
+            with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+                members = tar.getmembers()
+            assert {member.name.split("/")[0] for member in members} <= {"api", "frontend"}
+            assert all((m.uid, m.gid, m.mode) == (1001, 1002, 0o755) for m in members)
+        container.exec_run.assert_called_once()
+
+    def test_ownership_fixed_in_container_when_lookup_fails(
+        self, runtime: DockerRuntime, tmp_path: Path
+    ) -> None:
+        """Test that a single chown pass runs when the pentester ids are unknown."""
+        (tmp_path / "main.py").write_text("app")
+
+        container = MagicMock()
+        container.put_archive.side_effect = lambda _path, data: bool(b"".join(data))
+        container.exec_run.return_value = MagicMock(exit_code=1, output=b"")
+
+        runtime._copy_local_sources_to_container(container, [{"source_path": str(tmp_path)}])
+
+        assert container.exec_run.call_count == 2
+        assert "chown -R pentester:pentester" in container.exec_run.call_args.args[0]
+
+
+class TestRemoveExistingContainer:
+    """Tests for clearing a stale container before creating a new one."""
+
+    def test_waits_only_until_container_is_gone(self, runtime: DockerRuntime) -> None:
+        """Test that removal polling stops as soon as the name is released."""
+        from docker.errors import NotFound
+
+        existing = MagicMock()
+        runtime.client.containers.get.side_effect = [existing, existing, NotFound("gone")]
+
+        runtime._remove_existing_container("strix-scan-test")
+
+        existing.remove.assert_called_once_with(force=True)
+        assert runtime.client.containers.get.call_count == 3
+
+
+class TestFindScanContainer:
+    """Tests for locating an existing scan container."""
+
+    def test_label_lookup_prefers_running_container(self, runtime: DockerRuntime) -> None:
+        """Test that the label fallback inspects only the running match."""
+        from docker.errors import NotFound
+
+        running = MagicMock(status="running", attrs={"Config": {"Env": []}})
+        runtime.client.containers.get.side_effect = [NotFound("no such name"), running]
+        runtime.client.api.containers.return_value = [
+            {"Id": "exited-id", "State": "exited"},
+            {"Id": "running-id", "State": "running"},
+        ]
+
+        assert runtime._get_or_create_scan_container("scan-1") is running
+        assert runtime.client.containers.get.call_args.args == ("running-id",)
+        running.start.assert_not_called()
+
+    def test_running_container_checked_once_across_get_runtime_calls(
+        self, runtime: DockerRuntime, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that get_runtime callers share the container liveness check."""
+        import strix.runtime
+
+        monkeypatch.setattr(strix.runtime, "_runtime", None)
+        shared = get_runtime()
+        assert isinstance(shared, DockerRuntime)
+        container = MagicMock(id="container-id")
+        shared._scan_container = container
+        shared._tool_server_port = 9090
+        runtime.client.api.inspect_container.return_value = {"State": {"Status": "running"}}
+
+        for _ in range(2):
+            runtime_for_agent = get_runtime()
+            assert isinstance(runtime_for_agent, DockerRuntime)
+            assert runtime_for_agent._get_or_create_scan_container("scan-1") is container
+
+        assert get_runtime() is shared
+        runtime.client.api.inspect_container.assert_called_once_with("container-id")
+
+
+class TestCreateContainer:
+    """Tests for creating the scan container."""
+
+    @pytest.mark.parametrize(("platform", "held"), [("linux", True), ("darwin", False)])
+    def test_port_reservations_only_held_on_linux(
+        self, runtime: DockerRuntime, mocker: MockerFixture, platform: str, held: bool
+    ) -> None:
+        """Test that reserved ports are released before publishing them outside Linux."""
+        mocker.patch.object(docker_runtime.sys, "platform", platform)
+        mocker.patch.object(runtime, "_check_image_in_background")
+        mocker.patch.object(runtime, "_remove_existing_container")
+        mocker.patch.object(runtime, "_initialize_container")
+        find_available_port = runtime._find_available_port
+        sockets: list[Any] = []
+
+        def reserve_port() -> Any:
+            port, sock = find_available_port()
+            sockets.append(sock)
+            return port, sock
+
+        mocker.patch.object(runtime, "_find_available_port", side_effect=reserve_port)
+        open_during_run: list[bool] = []
+
+        def run(*_args: Any, **_kwargs: Any) -> MagicMock:
+            open_during_run.extend(sock.fileno() != -1 for sock in sockets)
+            return MagicMock()
+
+        runtime.client.containers.run.side_effect = run
+
+        runtime._create_container_with_retry("scan-1")
+
+        assert open_during_run == [held, held]
+        assert all(sock.fileno() == -1 for sock in sockets)
+
+
+class TestImageCheck:
+    """Tests for the background sandbox image check."""
+
+    def test_check_is_shared_until_refreshed(
+        self, runtime: DockerRuntime, mocker: MockerFixture
+    ) -> None:
+        """Test that runtimes reuse one image check and only a retry starts another."""
+        mocker.patch.object(DockerRuntime, "_image_ready", None)
+        verify = mocker.patch.object(DockerRuntime, "_verify_image_available")
+
+        first = runtime._check_image_in_background()
+        shared = DockerRuntime()._check_image_in_background()
+        first.result(timeout=5)
+        refreshed = runtime._check_image_in_background(refresh=True)
+        refreshed.result(timeout=5)
+
+        assert shared is first
+        assert refreshed is not first
+        assert verify.call_count == 2
+
+
+class TestDockerClient:
+    """Tests for Docker client reuse."""
+
+    def test_runtimes_share_one_client(self, runtime: DockerRuntime) -> None:
+        """Test that every runtime instance reuses the same Docker client."""
+        assert DockerRuntime().client is runtime.client
+
+
+class TestReadToolServerEnv:
+    """Tests for reading tool server settings from a container's environment."""
+
+    def test_port_and_token_are_read(self, runtime: DockerRuntime) -> None:
+        """Test that the port and token are parsed, keeping '=' inside values."""
+        container = MagicMock()
+        container.attrs = {
+            "Config": {"Env": ["PATH=/usr/bin", "TOOL_SERVER_PORT=9090", "TOOL_SERVER_TOKEN=abc=="]}
+        }
+
+        runtime._read_tool_server_env(container)
+
+        assert runtime._tool_server_port == 9090
+        assert runtime._tool_server_token == "abc=="  # noqa: S105
+
+    def test_missing_values_are_cleared(self, runtime: DockerRuntime) -> None:
+        """Test that a container without tool server settings leaves them unset."""
+        container = MagicMock()
+        container.attrs = {"Config": {"Env": None}}
+
+        runtime._read_tool_server_env(container)
+
+        assert runtime._tool_server_port is None
+        assert runtime._tool_server_token is None
+
+
+class TestToolServerRegistration:
+    """Tests for registering agents with the tool server."""
+
+    def test_no_client_left_open_across_agent_loops(
+        self, runtime: DockerRuntime, mocker: MockerFixture
+    ) -> None:
+        """Test that sandboxes created from separate event loops close their HTTP clients."""
+        import httpx
+
+        clients: list[httpx.AsyncClient] = []
+
+        async def post(self: httpx.AsyncClient, *_args: Any, **_kwargs: Any) -> httpx.Response:
+            clients.append(self)
+            return httpx.Response(200, request=httpx.Request("POST", "http://sandbox"))
+
+        mocker.patch.object(httpx.AsyncClient, "post", post)
+        mocker.patch.object(
+            runtime, "_get_or_create_scan_container", return_value=MagicMock(id="container-id")
+        )
+        runtime._tool_server_port = 9090
+
+        # Sub-agents each run on a new event loop in their own thread
+        for agent_id in ("agent-1", "agent-2"):
+            thread = threading.Thread(
+                target=asyncio.run, args=(runtime.create_sandbox(agent_id, existing_token="t"),)
+            )
+            thread.start()
+            thread.join(timeout=10)
+
+        assert len(clients) == 2
+        assert all(client.is_closed for client in clients)
+
+
+class TestRetryDelay:
+    """Tests for the retry backoff between Docker operations."""
+
+    def test_delay_grows_with_recent_failures_up_to_cap(self, mocker: MockerFixture) -> None:
+        """Test that each recent failure lengthens the delay until the cap is reached."""
+        mocker.patch.object(docker_runtime, "_recent_failures", docker_runtime.deque())
+        mocker.patch("strix.runtime.docker_runtime.random.random", return_value=0.5)
+
+        delays = [docker_runtime._retry_delay() for _ in range(8)]
+
+        assert delays[:3] == [0.75, 1.5, 2.25]
+        assert delays[-1] == docker_runtime._BACKOFF_CAP
+
+
+class TestNetworkOptions:
+    """Tests for choosing how the sandbox container is networked."""
+
+    def test_ports_published_by_default(self, runtime: DockerRuntime) -> None:
+        """Test that the default bridge network publishes both service ports."""
+        options = runtime._network_options("scan-1", 8080, 9090)
+
+        assert options == {
+            "hostname": "strix-scan-scan-1",
+            "ports": {"8080/tcp": 8080, "9090/tcp": 9090},
+        }
+
+    def test_host_network_when_enabled(self, runtime: DockerRuntime, mocker: MockerFixture) -> None:
+        """Test that opting into host networking drops port publishing and hostname."""
+        mocker.patch.object(docker_runtime, "_USE_HOST_NETWORK", new=True)
+
+        assert runtime._network_options("scan-1", 8080, 9090) == {"network_mode": "host"}
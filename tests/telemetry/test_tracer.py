@@ -0,0 +1,221 @@
+import json
+import tarfile
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from strix.telemetry.tracer import Tracer
+
+
+@pytest.fixture
+def tracer(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Tracer:
+    monkeypatch.chdir(tmp_path)
+    return Tracer(run_name="test-run")
+
+
+class TestSaveRunData:
+    """Tests for batching run data writes."""
+
+    def test_mutations_are_written_on_save(self, tracer: Tracer) -> None:
+        """Test that mutations only mark state dirty until the next save."""
+        report_id = tracer.add_vulnerability_report("SQLi", "details", "High")
+        vuln_file = tracer.get_run_dir() / "vulnerabilities" / f"{report_id}.md"
+
+        assert not vuln_file.exists()
+
+        tracer.save_run_data()
+
+        assert vuln_file.exists()
+        assert (tracer.get_run_dir() / "vulnerabilities.csv").exists()
+
+    def test_clean_sections_are_not_rewritten(self, tracer: Tracer) -> None:
+        """Test that a save without new mutations leaves existing files alone."""
+        tracer.add_vulnerability_report("SQLi", "details", "high")
+        tracer.save_run_data()
+        csv_file = tracer.get_run_dir() / "vulnerabilities.csv"
+        csv_file.unlink()
+
+        tracer.add_pending_vulnerability_report("XSS", "details", "low", evidence={})
+        tracer.save_run_data()
+
+        assert not csv_file.exists()
+        assert (tracer.get_run_dir() / "pending_verifications.jsonl").exists()
+
+    def test_csv_is_not_rewritten_after_failed_save(
+        self, tracer: Tracer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that retrying a failed save does not rewrite an up-to-date CSV."""
+        tracer.add_vulnerability_report("SQLi", "details", "high")
+        tracer.add_to_manual_review(
+            tracer.add_pending_vulnerability_report("XSS", "details", "low", evidence={}),
+            reason="agent crashed",
+        )
+        append_report_log = Tracer._append_report_log
+
+        def fail_manual_review(
+            self: Tracer, queue: Any, filename: str, *args: Any, **kwargs: Any
+        ) -> None:
+            if filename == "needs_manual_review.jsonl":
+                raise OSError("disk full")
+            append_report_log(self, queue, filename, *args, **kwargs)
+
+        with monkeypatch.context() as patched:
+            patched.setattr(Tracer, "_append_report_log", fail_manual_review)
+            tracer.save_run_data()
+        csv_file = tracer.get_run_dir() / "vulnerabilities.csv"
+        csv_file.unlink()
+
+        tracer.save_run_data()
+
+        assert not csv_file.exists()
+        assert (tracer.get_run_dir() / "needs_manual_review.jsonl").exists()
+
+    def test_report_files_can_be_archived(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that STRIX_ARCHIVE_REPORTS bundles vulnerability files into one tar."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("STRIX_ARCHIVE_REPORTS", "true")
+        tracer = Tracer(run_name="archived-run")
+        first = tracer.add_vulnerability_report("SQLi", "details", "high")
+        tracer.save_run_data()
+        second = tracer.add_vulnerability_report("XSS", "details", "low")
+        tracer.save_run_data()
+
+        run_dir = tracer.get_run_dir()
+        with tarfile.open(run_dir / "reports.tar") as archive:
+            names = archive.getnames()
+        assert names == [f"vulnerabilities/{first}.md", f"vulnerabilities/{second}.md"]
+        assert not (run_dir / "vulnerabilities").exists()
+        assert (run_dir / "vulnerabilities.csv").exists()
+
+    def test_reports_resolved_before_save_skip_pending_log(self, tracer: Tracer) -> None:
+        """Test that a report resolved before the flush is only saved in its final state."""
+        resolved = tracer.add_pending_vulnerability_report("XSS", "details", "low", evidence={})
+        pending = tracer.add_pending_vulnerability_report("IDOR", "details", "high", evidence={})
+        tracer.reject_vulnerability_report(resolved, reason="False positive")
+        tracer.save_run_data()
+
+        run_dir = tracer.get_run_dir()
+        pending_log = (run_dir / "pending_verifications.jsonl").read_text().splitlines()
+        rejected_log = (run_dir / "rejected_false_positives.jsonl").read_text().splitlines()
+        assert [json.loads(line)["id"] for line in pending_log] == [pending]
+        assert [json.loads(line)["status"] for line in rejected_log] == ["rejected"]
+        assert not tracer._unsaved_pending_reports
+
+    def test_reports_added_during_save_wait_for_next_save(
+        self, tracer: Tracer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a save writes a snapshot and reports added while writing come next."""
+        first = tracer.add_vulnerability_report("SQLi", "details", "high")
+        write_report_file = Tracer._write_report_file
+        added: list[str] = []
+
+        def write_and_add(self: Tracer, *args: Any) -> None:
+            write_report_file(self, *args)
+            if not added:
+                added.append(self.add_vulnerability_report("XSS", "details", "critical"))
+
+        monkeypatch.setattr(Tracer, "_write_report_file", write_and_add)
+        csv_file = tracer.get_run_dir() / "vulnerabilities.csv"
+
+        tracer.save_run_data()
+        first_rows = csv_file.read_text().splitlines()[1:]
+        tracer.save_run_data()
+        second_rows = csv_file.read_text().splitlines()[1:]
+
+        assert [row.split(",")[0] for row in first_rows] == [first]
+        assert [row.split(",")[0] for row in second_rows] == [added[0], first]
+        assert (tracer.get_run_dir() / "vulnerabilities" / f"{added[0]}.md").exists()
+
+    def test_cleanup_flushes_and_stops_background_writer(self, tracer: Tracer) -> None:
+        """Test that cleanup writes pending changes and stops the flush thread."""
+        tracer.add_vulnerability_report("SQLi", "details", "high")
+        thread = tracer._flush_thread
+        assert thread is not None
+
+        tracer.cleanup()
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert tracer.end_time is not None
+        assert (tracer.get_run_dir() / "vulnerabilities.csv").exists()
+
+    def test_csv_is_ordered_by_severity(self, tracer: Tracer) -> None:
+        """Test that the vulnerability index lists the most severe reports first."""
+        for severity in ("low", "critical", "unknown", "high", "critical"):
+            tracer.add_vulnerability_report(f"{severity} issue", "details", severity)
+        tracer.save_run_data()
+
+        rows = (tracer.get_run_dir() / "vulnerabilities.csv").read_text().splitlines()[1:]
+
+        assert [row.split(",")[2] for row in rows] == [
+            "CRITICAL",
+            "CRITICAL",
+            "HIGH",
+            "LOW",
+            "UNKNOWN",
+        ]
+        assert rows[0].startswith("vuln-0002,")
+
+
+class TestPendingReports:
+    """Tests for the pending verification queue."""
+
+    def test_report_ids_stay_unique_after_manual_review(self, tracer: Tracer) -> None:
+        """Test that moving a report to manual review does not free its ID."""
+        first = tracer.add_pending_vulnerability_report("A", "details", "high", evidence={})
+        second = tracer.add_pending_vulnerability_report("B", "details", "high", evidence={})
+        tracer.add_to_manual_review(first, reason="agent crashed")
+
+        third = tracer.add_pending_vulnerability_report("C", "details", "high", evidence={})
+
+        assert len({first, second, third}) == 3
+        assert [r["id"] for r in tracer.get_pending_reports()] == [second, third]
+        assert tracer.is_report_verified(first)
+        assert not tracer.is_report_verified(second)
+        assert not tracer.is_report_verified("vuln-9999")
+
+
+class TestToolExecutions:
+    """Tests for tool execution queries."""
+
+    def test_agent_tools_are_indexed_per_agent(self, tracer: Tracer) -> None:
+        """Test that executions are listed per agent in start order."""
+        tracer.log_agent_creation("agent-1", "root", "scan")
+        first = tracer.log_tool_execution_start("agent-1", "terminal_execute", {})
+        tracer.log_tool_execution_start("agent-2", "browser_action", {})
+        second = tracer.log_tool_execution_start("agent-1", "python_action", {})
+
+        assert [e["execution_id"] for e in tracer.get_agent_tools("agent-1")] == [first, second]
+        assert [e["tool_name"] for e in tracer.get_agent_tools("agent-2")] == ["browser_action"]
+        assert tracer.get_agent_tools("agent-3") == []
+
+    def test_real_tool_count_skips_info_tools(self, tracer: Tracer) -> None:
+        """Test that the real tool count leaves out the scan and subagent info entries."""
+        tracer.log_tool_execution_start("agent-1", "scan_start_info", {})
+        tracer.log_tool_execution_start("agent-1", "terminal_execute", {})
+        tracer.log_tool_execution_start("agent-2", "subagent_start_info", {})
+        tracer.log_tool_execution_start("agent-2", "browser_action", {})
+
+        assert tracer.get_real_tool_count() == 2
+
+
+class TestChatMessages:
+    """Tests for chat message records."""
+
+    def test_messages_are_slotted_records(self, tracer: Tracer) -> None:
+        """Test that chat messages are stored as records that convert back to dicts."""
+        message_id = tracer.log_chat_message("hello", "user", agent_id="agent-1")
+
+        message = tracer.chat_messages[0]
+        assert not hasattr(message, "__dict__")
+        assert message.to_dict() == {
+            "message_id": message_id,
+            "content": "hello",
+            "role": "user",
+            "agent_id": "agent-1",
+            "timestamp": message.timestamp,
+            "metadata": {},
+        }
@@ -0,0 +1,178 @@
+"""Tests for the agent graph tools."""
+
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from strix.tools.agents_graph import agents_graph_actions
+from strix.tools.agents_graph.agents_graph_actions import (
+    AgentMessage,
+    create_agent,
+    send_message_to_agent,
+    send_user_message_to_agent,
+    view_agent_graph,
+)
+
+
+@pytest.fixture
+def agent_graph(monkeypatch: pytest.MonkeyPatch) -> dict[str, Any]:
+    """Replace the module-level agent graph with an empty one."""
+    graph: dict[str, Any] = {"nodes": {}, "edges": []}
+    monkeypatch.setattr(agents_graph_actions, "_agent_graph", graph)
+    monkeypatch.setattr(agents_graph_actions, "_root_agent_id", None)
+    monkeypatch.setattr(agents_graph_actions, "_agent_messages", {})
+    monkeypatch.setattr(agents_graph_actions, "_delegation_children", {})
+    monkeypatch.setattr(agents_graph_actions, "_indexed_edge_count", 0)
+    return graph
+
+
+def _add_agent(graph: dict[str, Any], agent_id: str, parent_id: str | None = None) -> None:
+    graph["nodes"][agent_id] = {
+        "name": agent_id,
+        "task": f"{agent_id} task",
+        "status": "running",
+        "parent_id": parent_id,
+    }
+    if parent_id:
+        graph["edges"].append({"from": parent_id, "to": agent_id, "type": "delegation"})
+
+
+class TestViewAgentGraph:
+    """Tests for view_agent_graph."""
+
+    def test_tree_picks_up_children_added_between_calls(self, agent_graph: dict[str, Any]) -> None:
+        """Test that delegations made after an earlier view show up in the tree."""
+        state = MagicMock(agent_id="root")
+        _add_agent(agent_graph, "root")
+        _add_agent(agent_graph, "child-1", parent_id="root")
+        agent_graph["edges"].append({"from": "root", "to": "child-1", "type": "message"})
+        view_agent_graph(state)
+
+        _add_agent(agent_graph, "child-2", parent_id="root")
+        _add_agent(agent_graph, "grandchild", parent_id="child-1")
+        structure = view_agent_graph(state)["graph_structure"].splitlines()
+
+        agent_lines = [line.strip() for line in structure if line.strip().startswith("*")]
+        assert agent_lines == [
+            "* root (root) ← This is you",
+            "* child-1 (child-1)",
+            "* grandchild (grandchild)",
+            "* child-2 (child-2)",
+        ]
+
+    def test_summary_counts_statuses(self, agent_graph: dict[str, Any]) -> None:
+        """Test that the summary counts each status, grouping errors with failures."""
+        for agent_id, status in [
+            ("root", "running"),
+            ("a", "waiting"),
+            ("b", "completed"),
+            ("c", "failed"),
+            ("d", "error"),
+        ]:
+            _add_agent(agent_graph, agent_id, parent_id=None if agent_id == "root" else "root")
+            agent_graph["nodes"][agent_id]["status"] = status
+
+        summary = view_agent_graph(MagicMock(agent_id="root"))["summary"]
+
+        assert summary == {
+            "total_agents": 5,
+            "running": 1,
+            "waiting": 1,
+            "stopping": 0,
+            "completed": 1,
+            "stopped": 0,
+            "failed": 2,
+        }
+
+    def test_structure_can_be_skipped(self, agent_graph: dict[str, Any]) -> None:
+        """Test that include_structure=False returns only the summary."""
+        _add_agent(agent_graph, "root")
+
+        result = view_agent_graph(MagicMock(agent_id="root"), include_structure=False)
+
+        assert list(result) == ["summary"]
+        assert result["summary"]["total_agents"] == 1
+
+
+class TestSendMessageToAgent:
+    """Tests for send_message_to_agent."""
+
+    def test_message_is_queued_for_target(self, agent_graph: dict[str, Any]) -> None:
+        """Test that a sent message is queued as a delivered, unread record."""
+        _add_agent(agent_graph, "root")
+        _add_agent(agent_graph, "child", parent_id="root")
+
+        result = send_message_to_agent(MagicMock(agent_id="root"), "child", "status?", "query")
+
+        [message] = agents_graph_actions._agent_messages["child"]
+        assert isinstance(message, AgentMessage)
+        assert not hasattr(message, "__dict__")
+        assert (message.id, message.from_, message.content) == (
+            result["message_id"],
+            "root",
+            "status?",
+        )
+        assert message.delivered
+        assert not message.read
+
+
+class TestCreateAgent:
+    """Tests for create_agent."""
+
+    def test_running_agent_limit(
+        self, agent_graph: dict[str, Any], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that no sub-agent is started once STRIX_MAX_AGENTS agents are running."""
+        monkeypatch.setattr(agents_graph_actions, "_MAX_RUNNING_AGENTS", 1)
+        monkeypatch.setattr(agents_graph_actions, "_running_agents", {"child": MagicMock()})
+        monkeypatch.setattr(agents_graph_actions, "_starting_agents", 0)
+
+        result = create_agent(MagicMock(agent_id="root"), task="scan", name="second")
+
+        assert result["success"] is False
+        assert "1 agents are already running" in result["error"]
+        assert agent_graph["nodes"] == {}
+
+    @pytest.mark.usefixtures("agent_graph")
+    def test_limit_counts_agents_still_starting(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a call racing an agent still being set up cannot exceed the limit."""
+        monkeypatch.setattr(agents_graph_actions, "_MAX_RUNNING_AGENTS", 1)
+        monkeypatch.setattr(agents_graph_actions, "_running_agents", {})
+        monkeypatch.setattr(agents_graph_actions, "_agent_instances", {})
+        monkeypatch.setattr(agents_graph_actions, "_starting_agents", 0)
+        monkeypatch.setattr(agents_graph_actions, "_run_agent_in_thread", lambda *_: None)
+        racing: list[dict[str, Any]] = []
+
+        def build_agent(_config: dict[str, Any]) -> MagicMock:
+            racing.append(create_agent(MagicMock(agent_id="other"), task="scan", name="racer"))
+            return MagicMock()
+
+        monkeypatch.setattr("strix.agents.StrixAgent", build_agent)
+
+        result = create_agent(MagicMock(agent_id="root"), task="scan", name="first")
+
+        assert result["success"] is True
+        assert racing[0]["success"] is False
+        assert list(agents_graph_actions._running_agents) == [result["agent_id"]]
+        assert agents_graph_actions._starting_agents == 0
+
+
+class TestCheckAgentMessages:
+    """Tests for delivering queued messages to an agent."""
+
+    def test_inbox_is_drained_once(self, agent_graph: dict[str, Any]) -> None:
+        """Test that queued messages are added to the conversation and removed from the inbox."""
+        from strix.agents.base_agent import BaseAgent
+        from strix.agents.state import AgentState
+
+        state = AgentState(task="scan", agent_name="root")
+        _add_agent(agent_graph, state.agent_id)
+        send_user_message_to_agent(state.agent_id, "focus on the login form")
+
+        BaseAgent._check_agent_messages(MagicMock(), state)
+        BaseAgent._check_agent_messages(MagicMock(), state)
+
+        assert not agents_graph_actions._agent_messages[state.agent_id]
+        user_messages = [m["content"] for m in state.messages if m["role"] == "user"]
+        assert user_messages == ["focus on the login form"]
@@ -342,3 +342,20 @@ class TestRegistryIntegration:
             clear_registry()
             tools.extend(original_tools)
             _tools_by_name.update(original_by_name)
+
+
+class TestFormatToolResult:
+    """Tests for _format_tool_result screenshot handling."""
+
+    @pytest.mark.parametrize(
+        ("screenshot", "mime_type"),
+        [("/9j/4AAQSkZJRg==", "image/jpeg"), ("iVBORw0KGgo=", "image/png")],
+    )
+    def test_screenshot_mime_type(self, screenshot: str, mime_type: str) -> None:
+        """Test that attached screenshots are labelled with their encoded image type."""
+        from strix.tools.executor import _format_tool_result
+
+        text, images = _format_tool_result("browser_action", {"screenshot": screenshot})
+
+        assert images[0]["image_url"]["url"] == f"data:{mime_type};base64,{screenshot}"
+        assert screenshot not in text